@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Scaling benchmark for the site generators on synthetic data.
+
+For each size N it writes a synthetic bibliography with N entries (LaTeX
+accents, multi-author lists, journals, conferences and preprints) and
+courses/presentations/news CSV files with N rows, then times:
+
+  publications.parse   PublicationGenerator.load_bibtex (cold BibTeX cache)
+  publications.index   author index, publication index and statistics
+  publications.render  generate_publications_html
+  teaching             TeachingGenerator load + render
+  presentations        PresentationGenerator load + render
+  news                 NewsGenerator load + render
+  build                SiteBuilder.build_site(force=True) with cold caches
+
+Each benchmark reports seconds, items per second and the tracemalloc peak
+(measured in a second, separate run). Results are written as JSON together
+with the commit they were measured on; pass --compare to print the change
+against an earlier results file.
+
+Usage (from websitegen/):
+    python3 benchmarks/bench_build.py [--sizes 100 1000 10000 100000]
+        [--output results.json] [--compare old.json] [--no-memory] [--jobs N]
+"""
+import argparse
+import contextlib
+import csv
+import gc
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+import build_site  # noqa: E402
+
+ACCENTED = [r"{\'e}", r"\'a", r"{\"o}", r"\~n", r"{\^o}", r"{\`e}", r"\c{c}", r"\'{I}", r"{\'\i}"]
+SYLLABLES = ["ma", "ri", "lo", "pe", "jo", "sa", "vil", "chis", "me", "di", "na", "ber", "tan", "gui"]
+TOPICS = ["Non-monotonic Reasoning", "Multi-Robot Coordination", "Behavior Trees", "Logic Programming",
+          "Autonomous Gliders", "Swarm Robotics", "Knowledge Representation", "Embedded Systems"]
+VENUES_INT = ["International Conference on Intelligent Robots and Systems (IROS)",
+              "International Conference on Logic Programming", "IEEE OCEANS",
+              "Autonomous Robots and Multirobot Systems (ARMS) @ AAMAS"]
+VENUES_NAT = ["Journ{\\'e}es d'Intelligence Artificielle Fondamentale (JIAF)", "Conf{\\'e}rence JFPDA"]
+JOURNALS = ["Robotics and Autonomous Systems", "Journal of Logic and Computation", "Applied Intelligence"]
+MONTHS = ["Jan", "Feb", "March", "April", "May", "June", "July", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def synthetic_name(rng):
+    def word():
+        parts = [rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))]
+        if rng.random() < 0.4:
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(ACCENTED))
+        return "".join(parts).capitalize()
+    if rng.random() < 0.5:
+        return f"{word()}, {word()}"
+    return f"{word()} {{{word()} {word()}}}"
+
+
+def write_bib(path, count, rng):
+    authors = [synthetic_name(rng) for _ in range(max(20, count // 5))]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("%% Synthetic bibliography for benchmarks\n\n")
+        for i in range(count):
+            names = rng.sample(authors, rng.randint(1, 8))
+            if rng.random() < 0.6:
+                names.insert(rng.randrange(len(names) + 1), r"\textbf{Jos{\'e}-Luis {Vilchis Medina}}")
+            title = f"{rng.choice(TOPICS)} for {rng.choice(TOPICS).lower()}: part {i}"
+            kind = rng.random()
+            fields = [f"title = {{{title}}}", f"author = {{{' and '.join(names)}}}",
+                      f"year = {{{rng.randint(1995, 2026)}}}"]
+            if kind < 0.35:
+                entry_type = "article"
+                fields += [f"journal = {{{rng.choice(JOURNALS)}}}", f"volume = {{{rng.randint(1, 80)}}}",
+                           f"pages = {{{rng.randint(1, 400)}--{rng.randint(401, 800)}}}"]
+            elif kind < 0.85:
+                entry_type = "inproceedings"
+                national = rng.random() < 0.3
+                venue = rng.choice(VENUES_NAT if national else VENUES_INT)
+                fields += [f"booktitle = {{{venue}}}", f"keywords = {{{'national' if national else 'world'}}}"]
+            else:
+                entry_type = "misc"
+                fields += ["journal = {arXiv preprint}", f"eprint = {{2{rng.randint(100, 999)}.{i:05d}}}"]
+            if rng.random() < 0.5:
+                fields.append(f"doi = {{10.{rng.randint(1000, 9999)}/synthetic.{i}}}")
+            if rng.random() < 0.3:
+                fields.append(f"url = {{https://example.org/papers/{i}}}")
+            body = ",\n    ".join(fields)
+            f.write(f"@{entry_type}{{synthetic{i},\n    {body},\n}}\n\n")
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def write_dataset(folder, count, seed=1):
+    """Write mybiblio.bib and the three CSV files with count entries each; return the file paths"""
+    rng = random.Random(seed)
+    paths = {name: os.path.join(folder, name)
+             for name in ("mybiblio.bib", "courses.csv", "presentations.csv", "news.csv")}
+    write_bib(paths["mybiblio.bib"], count, rng)
+
+    def academic_year():
+        start = rng.randint(2005, 2025)
+        return f"{start}-{(start + 1) % 100:02d}"
+    write_csv(paths["courses.csv"], ["Academic Year", "Institution", "Lecture Type", "Lecture Name", "Duration"],
+              [[academic_year(), rng.choice(["ENSTA-Bretagne", "École navale", "Aix-Marseille Université"]),
+                rng.choice(["Lecture", "Tutorial", "Laboratory Session"]), f"{rng.choice(TOPICS)} {i}",
+                f"S{rng.randint(1, 8)} / {rng.randint(2, 40)}h"] for i in range(count)])
+    write_csv(paths["presentations.csv"], ["Year", "Type", "Month", "Event", "Title", "Place", "Authors"],
+              [[rng.randint(2005, 2026), "Other", rng.choice(MONTHS), rng.choice(VENUES_INT),
+                f"{rng.choice(TOPICS)} & applications ({i})", "Brest, France",
+                "José-Luis Vilchis-Medina" if rng.random() < 0.7 else ""] for i in range(count)])
+    today = datetime.now()
+    write_csv(paths["news.csv"], ["date", "event", "link"],
+              [[(today + timedelta(days=rng.randint(-1500, 400))).strftime("%Y-%m-%d"),
+                f"Article accepted: {rng.choice(TOPICS)} {i}",
+                f"https://example.org/news/{i}" if rng.random() < 0.5 else ""] for i in range(count)])
+    return paths
+
+
+def clear_caches(config):
+    shutil.rmtree(config['CACHE_DIR'], ignore_errors=True)
+    build_site.cached_latex_to_html.cache_clear()
+
+
+def measure(setup, func, memory):
+    """(seconds, tracemalloc peak in MB or None) for func() after setup()"""
+    state = setup()
+    gc.collect()
+    start = time.perf_counter()
+    func(state)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        state = setup()
+        gc.collect()
+        tracemalloc.start()
+        func(state)
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def benchmarks(config):
+    """(name, setup, func) for every benchmark on the dataset described by config"""
+    def fresh_pub_gen():
+        clear_caches(config)
+        return build_site.PublicationGenerator(config)
+
+    def loaded():
+        gen = fresh_pub_gen()
+        bib_db = gen.load_bibtex()
+        return gen, bib_db
+
+    def indexed():
+        gen, bib_db = loaded()
+        gen.build_author_index(bib_db.entries)
+        index = gen.index_publications(bib_db.entries)
+        build_site.cached_latex_to_html.cache_clear()
+        return gen, bib_db, index
+
+    def index_step(state):
+        gen, bib_db = state
+        gen.build_author_index(bib_db.entries)
+        gen.generate_stats(bib_db, index=gen.index_publications(bib_db.entries))
+
+    def quiet(func):
+        def run(state):
+            with contextlib.redirect_stdout(io.StringIO()):
+                func(state)
+        return run
+
+    def full_build(_):
+        shutil.rmtree(config['OUTPUT_DIR'], ignore_errors=True)
+        clear_caches(config)
+        build_site.SiteBuilder(config).build_site(force=True)
+
+    teach = build_site.TeachingGenerator(config)
+    pres = build_site.PresentationGenerator(config)
+    news = build_site.NewsGenerator(config)
+    return [
+        ("publications.parse", fresh_pub_gen, lambda gen: gen.load_bibtex()),
+        ("publications.index", loaded, index_step),
+        ("publications.render", indexed,
+         lambda state: state[0].generate_publications_html(state[1], index=state[2])),
+        ("teaching", lambda: None, lambda _: teach.generate_courses_html(teach.load_courses())),
+        ("presentations", lambda: None, lambda _: pres.generate_presentations_html(pres.load_presentations())),
+        ("news", lambda: None, lambda _: news.generate_news_html(news.load_news())),
+        ("build", lambda: None, quiet(full_build)),
+    ]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, old_path):
+    with open(old_path, encoding="utf-8") as f:
+        old = {(r['size'], r['benchmark']): r for r in json.load(f)['results']}
+    print(f"\nChange against {old_path}:")
+    for r in results:
+        before = old.get((r['size'], r['benchmark']))
+        if before and r['seconds']:
+            print(f"  {r['benchmark']:<20} N={r['size']:<7} {before['seconds'] / r['seconds']:6.2f}x faster")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--output", help="results file (default: benchmarks/results/bench_build-<commit>.json)")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="print the speed-up against an earlier results file")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--jobs", type=int, help="CONFIG['JOBS'] for the build benchmark (default: CONFIG's)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            folder = os.path.join(tmp, str(size))
+            os.makedirs(folder)
+            paths = write_dataset(folder, size)
+            config = dict(build_site.CONFIG,
+                          BIB_FILE=paths["mybiblio.bib"], COURSES_CSV=paths["courses.csv"],
+                          PRESENTATIONS_CSV=paths["presentations.csv"], NEWS_CSV=paths["news.csv"],
+                          OUTPUT_DIR=os.path.join(folder, "dist"), CACHE_DIR=os.path.join(folder, ".cache"),
+                          JOBS=args.jobs or build_site.CONFIG['JOBS'])
+            print(f"N = {size}")
+            for name, setup, func in benchmarks(config):
+                seconds, peak = measure(setup, func, not args.no_memory)
+                results.append({'benchmark': name, 'size': size, 'seconds': seconds,
+                                'items_per_second': size / seconds if seconds else None, 'peak_mb': peak})
+                memory = f"{peak:8.1f} MB" if peak is not None else ""
+                print(f"  {name:<20} {seconds * 1000:10.1f} ms {size / seconds:12.0f} items/s {memory}")
+
+    output = args.output or os.path.join(HERE, "results", f"bench_build-{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({'commit': commit, 'date': datetime.now().isoformat(timespec="seconds"),
+                   'python': platform.python_version(), 'platform': platform.platform(), 'jobs': args.jobs,
+                   'results': results}, f, indent=2)
+        f.write("\n")
+    print(f"Results written to {output}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
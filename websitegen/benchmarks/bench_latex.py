@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for the LaTeX-to-Unicode transcoder.
+
+Compares the table-driven latex_to_html in build_site.py against the former
+regex chain (kept below as a reference), checks that both agree on the
+project bibliography, and times them on a synthetic 50k-author corpus.
+
+Usage (from websitegen/):
+    python3 benchmarks/bench_latex.py [--authors 50000] [--distinct 5000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import build_site  # noqa: E402
+
+
+def legacy_latex_to_unicode(text):
+    """The regex chain used before the single-pass transcoder"""
+    if not text:
+        return text
+
+    def replace_accent(match):
+        cmd, char = match.groups()
+        if cmd == "'":
+            return {'a': 'á', 'e': 'é', 'i': 'í', 'o': 'ó', 'u': 'ú',
+                    'A': 'Á', 'E': 'É', 'I': 'Í', 'O': 'Ó', 'U': 'Ú'}.get(char, char)
+        elif cmd == "`":
+            return {'a': 'à', 'e': 'è'}.get(char, char)
+        elif cmd == '"':
+            return {'a': 'ä', 'e': 'ë', 'i': 'ï', 'o': 'ö', 'u': 'ü'}.get(char, char)
+        elif cmd == "~":
+            return {'n': 'ñ', 'N': 'Ñ'}.get(char, char)
+        elif cmd == "^":
+            return {'a': 'â', 'e': 'ê', 'i': 'î', 'o': 'ô', 'u': 'û',
+                    'A': 'Â', 'E': 'Ê', 'I': 'Î', 'O': 'Ô', 'U': 'Û'}.get(char, char)
+        return char
+
+    text = re.sub(r"\\([`'\"~^])\{([aeiouAEIOU])\}", replace_accent, text)
+    text = re.sub(r"\\([`'\"~^])([aeiouAEIOU])", replace_accent, text)
+    text = re.sub(r"\\c\{([cC])\}", lambda m: 'ç' if m.group(1) == 'c' else 'Ç', text)
+    return text.replace('{', '').replace('}', '')
+
+
+def legacy_latex_to_html(text):
+    return build_site.sanitize_html(legacy_latex_to_unicode(text))
+
+
+def bib_strings():
+    """Titles, venues and authors from the project bibliography"""
+    gen = build_site.PublicationGenerator(build_site.CONFIG)
+    strings = []
+    for entry in gen.iter_bibtex():
+        for field in ("title", "journal", "booktitle"):
+            if field in entry:
+                strings.append(entry[field])
+        strings.extend(a.strip() for a in entry.get("author", "").split(" and ") if a.strip())
+    return strings
+
+
+def synthetic_authors(count, distinct, seed=1):
+    """Author names with the accents legacy_latex_to_unicode understands"""
+    rng = random.Random(seed)
+    accented = [r"{\'e}", r"\'a", r"{\"o}", r"\~n", r"{\^o}", r"{\`e}", r"\c{c}", r"\'{I}"]
+    syllables = ["ma", "ri", "lo", "pe", "jo", "sa", "vil", "chis", "me", "di", "na", "ber"]
+
+    def word():
+        parts = [rng.choice(syllables) for _ in range(rng.randint(2, 4))]
+        parts.insert(rng.randrange(len(parts) + 1), rng.choice(accented))
+        return "".join(parts).capitalize()
+
+    pool = [f"{word()}, {word()}" if rng.random() < 0.5 else f"{word()} {{{word()} {word()}}}"
+            for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def timed(func, corpus):
+    start = time.perf_counter()
+    for text in corpus:
+        func(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--authors", type=int, default=50000)
+    parser.add_argument("--distinct", type=int, default=5000)
+    args = parser.parse_args()
+
+    mismatches = [s for s in bib_strings() if build_site.latex_to_html(s) != legacy_latex_to_html(s)]
+    print(f"Project bibliography: {len(mismatches)} mismatches with the legacy converter")
+    for text in mismatches[:10]:
+        print(f"  {text!r}: {legacy_latex_to_html(text)!r} != {build_site.latex_to_html(text)!r}")
+
+    corpus = synthetic_authors(args.authors, args.distinct)
+    legacy = timed(legacy_latex_to_html, corpus)
+    build_site.cached_latex_to_html.cache_clear()
+    uncached = timed(build_site.latex_to_html, corpus)
+    memoized = timed(build_site.cached_latex_to_html, corpus)
+
+    print(f"Corpus: {len(corpus)} authors, {args.distinct} distinct")
+    print(f"  legacy regex chain : {legacy * 1000:8.1f} ms")
+    print(f"  single pass        : {uncached * 1000:8.1f} ms  ({legacy / uncached:.1f}x)")
+    print(f"  single pass + LRU  : {memoized * 1000:8.1f} ms  ({legacy / memoized:.1f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Memory of plain dict rows against the compact record types.
+
+Builds N rows of each kind twice, once as the dicts the loaders used to
+return and once as Publication, Course, Presentation and NewsItem records,
+and reports the memory the rows keep alive (tracemalloc), bytes per row and
+the time to build them (under tracemalloc, source rows included). Publications start from a parsed synthetic
+bibliography of 2000 entries, repeated with fresh string copies up to N so
+that interning has the same work to do as after a real parse; the CSV rows
+come from the synthetic files of bench_build.
+
+Usage (from websitegen/):
+    python3 benchmarks/bench_records.py [--rows 100000]
+"""
+import argparse
+import csv
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, ".."))
+import build_site  # noqa: E402
+from bench_build import write_dataset  # noqa: E402
+
+BIB_ENTRIES = 2000
+
+
+def fresh(value):
+    """An equal string that is a new object, as the parser would return it"""
+    return (value + ".")[:-1] if isinstance(value, str) else value
+
+
+def bib_dicts(path, rows):
+    with open(path, encoding="utf-8") as f:
+        parsed = build_site.bibtexparser.loads(f.read(), parser=build_site.new_bibtex_parser()).entries
+    return lambda: [{k: fresh(v) for k, v in parsed[i % len(parsed)].items()} for i in range(rows)]
+
+
+def csv_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    return lambda: [{k: fresh(v) for k, v in row.items()} for row in rows]
+
+
+def cases(paths, rows):
+    """(name, make dict rows, make records) for each row type"""
+    entries = bib_dicts(paths["mybiblio.bib"], rows)
+    courses = csv_rows(paths["courses.csv"])
+    presentations = csv_rows(paths["presentations.csv"])
+    news = csv_rows(paths["news.csv"])
+    return [
+        ("publications", entries,
+         lambda: [build_site.Publication.from_entry(e) for e in entries()]),
+        ("courses",
+         lambda: [{'type': r['Lecture Type'], 'name': r['Lecture Name'], 'duration': r['Duration']}
+                  for r in courses()],
+         lambda: [build_site.Course(r['Lecture Type'], r['Lecture Name'], r['Duration']) for r in courses()]),
+        ("presentations",
+         lambda: [{'title': r['Title'], 'event': r['Event'], 'location': r['Place'], 'month': r['Month'],
+                   'authors': r['Authors']} for r in presentations()],
+         lambda: [build_site.Presentation(r['Title'], r['Event'], r['Place'], r['Month'], r['Authors'])
+                  for r in presentations()]),
+        ("news",
+         lambda: [{'date': datetime.strptime(r['date'], '%Y-%m-%d'), 'event': r['event'], 'link': r['link']}
+                  for r in news()],
+         lambda: [build_site.NewsItem(datetime.strptime(r['date'], '%Y-%m-%d'), r['event'], r['link'])
+                  for r in news()]),
+    ]
+
+
+def measure(make):
+    """(MB kept alive by the result of make(), seconds to build it)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = make()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    kept = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rows
+    return kept / (1024 * 1024), seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_dataset(tmp, args.rows)
+        # Parsing N entries would dominate the run; BIB_ENTRIES are repeated instead
+        os.makedirs(os.path.join(tmp, "bib"))
+        paths["mybiblio.bib"] = write_dataset(os.path.join(tmp, "bib"), BIB_ENTRIES)["mybiblio.bib"]
+        print(f"{args.rows} rows per type")
+        print(f"  {'type':<15} {'dicts MB':>9} {'records MB':>11} {'B/row':>13} {'saved':>6} "
+              f"{'dicts s':>8} {'records s':>10}")
+        for name, make_dicts, make_records in cases(paths, args.rows):
+            dict_mb, dict_s = measure(make_dicts)
+            record_mb, record_s = measure(make_records)
+            per_row = f"{dict_mb * 2**20 / args.rows:.0f} → {record_mb * 2**20 / args.rows:.0f}"
+            print(f"  {name:<15} {dict_mb:9.1f} {record_mb:11.1f} {per_row:>13} "
+                  f"{1 - record_mb / dict_mb:6.0%} {dict_s:8.2f} {record_s:10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
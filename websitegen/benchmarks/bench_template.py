@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark for CompiledTemplate against chained str.replace calls.
+
+Builds a synthetic template with hundreds of <!-- SLOT --> placeholders,
+fills it both ways, checks that the output is byte-identical and reports
+the time per render.
+
+Usage (from websitegen/):
+    python3 benchmarks/bench_template.py [--slots 300] [--repeat 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import build_site  # noqa: E402
+
+
+def synthetic_template(slots, seed=1):
+    """Template text, the slot values and the slots left unfilled on purpose"""
+    rng = random.Random(seed)
+    names = [f"SLOT_{i}" for i in range(slots)]
+    chunks = []
+    for name in names:
+        chunks.append("<div class=\"block\">\n" + "    <p>lorem ipsum dolor sit amet</p>\n" * rng.randint(1, 6))
+        chunks.append(f"<!-- {name} -->\n</div>\n")
+    values = {name: f"<section id=\"{name.lower()}\">" + "x" * rng.randint(50, 2000) + "</section>"
+              for name in names[::2]}
+    return "".join(chunks), values
+
+
+def chained_replace(text, values):
+    for name, value in values.items():
+        text = text.replace(f"<!-- {name} -->", value)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    text, values = synthetic_template(args.slots)
+
+    start = time.perf_counter()
+    template = build_site.CompiledTemplate(text)
+    compile_time = time.perf_counter() - start
+
+    if template.render(values) != chained_replace(text, values):
+        print("❌ Compiled output differs from chained replace")
+        return 1
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        chained_replace(text, values)
+    chained = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        template.render(values)
+    compiled = (time.perf_counter() - start) / args.repeat
+
+    print(f"Template: {len(text) / 1024:.0f} KB, {len(template.slots)} slots, "
+          f"{len(values)} filled, {len(template.unfilled(values))} unfilled")
+    print(f"  compile once       : {compile_time * 1000:8.2f} ms")
+    print(f"  chained replace    : {chained * 1000:8.2f} ms/render")
+    print(f"  compiled template  : {compiled * 1000:8.2f} ms/render  ({chained / compiled:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Thin client for the resident build daemon (python3 build_site.py --daemon)
+
+Sends a build request over the daemon's Unix socket and prints its log and
+stage timings. When no daemon is running, the site is built in this process
+instead. Only the standard library is imported until that fallback, so a
+request costs little more than the interpreter start-up.
+
+Usage (from websitegen/):
+    python3 build_client.py [--force] [--streaming] [--no-fallback]
+
+From Python (e.g. the GUI): build_client.build() returns True on success.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+# Must match CONFIG['DAEMON_SOCKET'] in build_site.py
+DEFAULT_SOCKET = os.path.join(".cache", "build.sock")
+
+
+def request_build(options, socket_path=DEFAULT_SOCKET, timeout=600):
+    """Ask the daemon for a build; return its reply, or None if no daemon is listening"""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(socket_path)
+        client.sendall(json.dumps({'options': options, 'cwd': os.getcwd()}).encode("utf-8") + b"\n")
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None
+    finally:
+        client.close()
+    return json.loads(data) if data else None
+
+
+def build_in_process(options):
+    import build_site
+    try:
+        build_site.SiteBuilder(build_site.CONFIG).build_site(**options)
+    except Exception as e:
+        print(f"❌ Build failed: {e}")
+        return False
+    return True
+
+
+def build(force=False, streaming=False, fallback=True, socket_path=DEFAULT_SOCKET):
+    """Build through the daemon if one is running, else in this process; return True on success"""
+    options = {'force': force, 'streaming': streaming}
+    reply = request_build(options, socket_path)
+    if reply is None or (not reply['ok'] and 'log' not in reply):
+        if reply is not None:
+            print(f"⚠️ Build daemon refused the request: {reply['error']}")
+        if not fallback:
+            print("❌ No build daemon running (start it with: python3 build_site.py --daemon)")
+            return False
+        print("ℹ️ No build daemon running, building in-process")
+        return build_in_process(options)
+
+    print(reply.get('log', ''), end="")
+    if not reply['ok']:
+        print(f"❌ Build failed in the daemon: {reply['error']}")
+        return False
+    print(f"🛰️ Daemon build #{reply['build']} in {reply['seconds'] * 1000:.0f} ms")
+    for stage in reply['stages']:
+        label = "  " * stage['depth'] + stage['name']
+        print(f"   {label:<40} {stage['wall_ms']:>9.1f} ms")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="render every section again")
+    parser.add_argument("--streaming", action="store_true", help="constant-memory build")
+    parser.add_argument("--no-fallback", action="store_true", help="fail instead of building in-process")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"daemon socket (default: {DEFAULT_SOCKET})")
+    args = parser.parse_args()
+    ok = build(force=args.force, streaming=args.streaming, fallback=not args.no_fallback,
+               socket_path=args.socket)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,103 @@
 #!/usr/bin/env python3
 import bibtexparser
 from bibtexparser.bparser import BibTexParser
-from datetime import datetime
+from bibtexparser.bibdatabase import BibDatabase
+from datetime import datetime, timedelta, timezone
 import shutil
 import os
 import csv
-from collections import defaultdict
+from collections import defaultdict, Counter
 import re
 import unicodedata
+import hashlib
+import pickle
+import tempfile
+import functools
+import filecmp
+import subprocess
+import string
+import io
+from array import array
+import argparse
+import json
+import copy
+import sys
+import gzip
+import time
+import tracemalloc
+import cProfile
+import pstats
+import contextlib
+import struct
+import select
+import threading
+import ctypes
+import ctypes.util
+import http.server
+import socket
+import socketserver
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from html.parser import HTMLParser
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # responsive image variants are skipped without Pillow
+    Image = None
+try:
+    import brotli
+except ImportError:  # .br files are skipped without the brotli package
+    brotli = None
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
 # Configuration
 CONFIG = {
     'COURSES_CSV': "data/courses.csv",
     'PRESENTATIONS_CSV': "data/presentations.csv",
     'NEWS_CSV': "data/news.csv",
+    # Number of upcoming news items shown
+    'NEWS_ITEMS': 3,
     'BIB_FILE': "data/mybiblio.bib",
     'TEMPLATE_FILE': "template_base.html",
     'OUTPUT_DIR': "dist",
     'CSS_FILE': "styles.css",
+    'JS_FILE': "tabs.js",
     'IMG_DIR': "../../imgs",
+    'CACHE_DIR': ".cache",
+    # Unix socket of the resident build daemon (build_site.py --daemon, build_client.py)
+    'DAEMON_SOCKET': ".cache/build.sock",
+    'FINGERPRINT_ASSETS': True,
+    # Stamp LAST_UPDATED with the date of the inputs instead of the build's
+    # (SOURCE_DATE_EPOCH, else their last commit, else the newest mtime), so
+    # unchanged inputs rebuild byte-identical output
+    'REPRODUCIBLE': False,
+    # Minify index.html, fragments and CSS, then write precompressed copies
+    # next to each text file for static hosting ('br' needs the brotli package)
+    'MINIFY': True,
+    # Drop CSS rules that match nothing in the built pages and inline the rules
+    # needed to render the page down to the CRITICAL_UNTIL section
+    'OPTIMIZE_CSS': True,
+    'CRITICAL_UNTIL': "academic-background",
+    'PRECOMPRESS': ["gz", "br"],
+    'RESPONSIVE_IMAGES': True,
+    # How the scroll script follows the section in view: 'observer' or 'scroll'
+    'SCROLL_TRACKING': "observer",
+    # Sections whose hidden years are written to separate fragment files and
+    # fetched when their tab is clicked: 'publications', 'courses', 'presentations'
+    'LAZY_YEARS': [],
+    # The profile photo is cropped to a circle by height, so it is drawn
+    # wider than its 110px (90px on mobile) frame
+    'IMAGE_WIDTHS': [200, 400, 800],
+    'IMAGE_SIZES': "(max-width: 768px) 160px, 200px",
+    'IMAGE_QUALITY': 80,
+    # Parallel workers of a build: threads loading and rendering the sections,
+    # processes for image variants and precompression (None: default pool sizes,
+    # 1: everything in the main thread)
+    'JOBS': None,
+    # Only list the BibTeX entries with an author in AUTHOR_VARIANTS, for a
+    # bibliography shared by several people (see --batch)
+    'FILTER_BY_AUTHOR': False,
     'AUTHOR_VARIANTS': [
         "José-Luis Vilchis-Medina",
         "José-Luis Vilchis Medina",
@@ -48,40 +127,853 @@ def sanitize_html(text):
                 .replace('"', "&quot;"))
 
 
-class PublicationGenerator:
+# LaTeX accent commands and the Unicode combining mark each one adds
+LATEX_ACCENTS = {
+    "'": "\u0301", "`": "\u0300", "^": "\u0302", '"': "\u0308", "~": "\u0303",
+    "=": "\u0304", ".": "\u0307", "u": "\u0306", "v": "\u030c", "H": "\u030b",
+    "c": "\u0327", "k": "\u0328", "r": "\u030a", "d": "\u0323", "b": "\u0331",
+}
+# Letter-like LaTeX commands (\ss, \o, ...) and escaped special characters
+LATEX_SYMBOLS = {
+    "ss": "ß", "ae": "æ", "AE": "Æ", "oe": "œ", "OE": "Œ", "aa": "å", "AA": "Å",
+    "o": "ø", "O": "Ø", "l": "ł", "L": "Ł", "i": "ı", "j": "ȷ",
+    "&": "&", "%": "%", "$": "$", "#": "#", "_": "_", "{": "{", "}": "}",
+}
+
+
+def _build_accent_table():
+    """Precomposed result for every accent applied to every ASCII letter (and dotless i/j)"""
+    bases = {c: c for c in string.ascii_letters}
+    bases.update({'\\i': 'i', '\\j': 'j'})
+    return {(cmd, base): unicodedata.normalize('NFC', letter + mark)
+            for cmd, mark in LATEX_ACCENTS.items()
+            for base, letter in bases.items()}
+
+
+LATEX_ACCENT_TABLE = _build_accent_table()
+HTML_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}
+# One tokenizer for everything latex_to_unicode rewrites. Every token is
+# looked up by its text in a table that fills itself on first use.
+LATEX_TOKEN_PATTERN = r"""
+    \\(?:(?P<sym_accent>[`'^"~=.])\s*(?:\{\s*(?P<sym_base1>\\[ij]|[A-Za-z])\s*\}|(?P<sym_base2>\\[ij](?![A-Za-z])|[A-Za-z]))
+       |(?P<word_accent>[uvHckrdb])(?:\s*\{\s*(?P<word_base1>\\[ij]|[A-Za-z])\s*\}|\s+(?P<word_base2>\\[ij](?![A-Za-z])|[A-Za-z]))
+       |(?P<word>ss|ae|AE|oe|OE|aa|AA|[oOlLij])(?![A-Za-z])(?:\{\}|\s+)?
+       |(?P<escaped>[&%$\#_{}]))
+  | [{}$][{}$]*
+  | ~
+"""
+LATEX_TOKEN = re.compile(LATEX_TOKEN_PATTERN, re.VERBOSE)
+LATEX_HTML_TOKEN = re.compile(LATEX_TOKEN_PATTERN + r'  | [&<>"]', re.VERBOSE)
+
+
+def _latex_replacement(token):
+    """Unicode text for one LaTeX token"""
+    if token == "~":
+        return "\u00a0"
+    match = LATEX_TOKEN.fullmatch(token)
+    groups = match.groupdict()
+    if groups['sym_accent']:
+        return LATEX_ACCENT_TABLE[groups['sym_accent'], groups['sym_base1'] or groups['sym_base2']]
+    if groups['word_accent']:
+        return LATEX_ACCENT_TABLE[groups['word_accent'], groups['word_base1'] or groups['word_base2']]
+    if groups['word']:
+        return LATEX_SYMBOLS[groups['word']]
+    if groups['escaped']:
+        return groups['escaped']
+    return ""
+
+
+class _TokenTable(dict):
+    """Replacement for each distinct token text, filled in on first use"""
+    def __init__(self, html):
+        super().__init__()
+        self.html = html
+
+    def __missing__(self, token):
+        if token in HTML_ESCAPES:
+            text = HTML_ESCAPES[token]
+        else:
+            text = _latex_replacement(token)
+            if self.html:
+                text = HTML_ESCAPES.get(text, text)
+        self[token] = text
+        return text
+
+    def replace(self, match):
+        return self[match.group()]
+
+
+_UNICODE_TOKENS = _TokenTable(html=False)
+_HTML_TOKENS = _TokenTable(html=True)
+
+
+def latex_to_unicode(text):
+    """Convert LaTeX accents, special letters and protection braces to plain Unicode"""
+    if not text:
+        return text
+    return LATEX_TOKEN.sub(_UNICODE_TOKENS.replace, text)
+
+
+def latex_to_html(text):
+    """latex_to_unicode followed by sanitize_html, done in a single pass"""
+    if not text:
+        return ""
+    return LATEX_HTML_TOKEN.sub(_HTML_TOKENS.replace, text)
+
+
+@functools.lru_cache(maxsize=4096)
+def cached_latex_to_html(text):
+    """latex_to_html memoized, for strings repeated across entries such as venues.
+
+    Per-entry fields (titles) go through latex_to_html so they do not fill
+    the cache; its size is fixed, so streaming builds stay bounded.
+    """
+    return latex_to_html(text)
+
+
+def atomic_write(path, writer):
+    """Call writer(tmp) to create path's new content in tmp, next to path, then move it onto path
+
+    Readers of path never see a partly written file; tmp is removed if writer fails.
+    """
+    tmp = path + ".tmp"
+    try:
+        writer(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def atomic_copy(src, dest):
+    """Copy src (with its metadata) onto dest through atomic_write"""
+    atomic_write(dest, lambda tmp: shutil.copy2(src, tmp))
+
+
+def write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def write_pickle(path, obj):
+    """Atomically write obj to path as a pickle and return its size in bytes"""
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    atomic_write(path, lambda tmp: write_bytes(tmp, data))
+    return len(data)
+
+
+def pool_map(func, *iterables, jobs=None):
+    """list(map(func, ...)) spread over a process pool, unless jobs is 1 or there is a single call"""
+    calls = list(zip(*iterables))
+    if jobs == 1 or len(calls) < 2:
+        return [func(*args) for args in calls]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(func, *zip(*calls)))
+
+
+def write_if_changed(path, data):
+    """Atomically replace path with data (bytes) unless it already holds exactly that; True if written"""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    atomic_write(path, lambda tmp: write_bytes(tmp, data))
+    return True
+
+
+def replace_if_changed(tmp, path):
+    """Move the finished file tmp onto path, or drop it if path has the same bytes; True if replaced"""
+    if os.path.exists(path) and filecmp.cmp(tmp, path, shallow=False):
+        os.remove(tmp)
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def snapshot_dir(folder):
+    """{relative path: (size, mtime_ns)} of every file under folder"""
+    files = {}
+    for root, _, names in os.walk(folder):
+        for name in names:
+            path = os.path.join(root, name)
+            st = os.stat(path)
+            files[os.path.relpath(path, folder).replace(os.sep, "/")] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+def source_date(paths):
+    """Build date for reproducible builds, from the inputs rather than the clock
+
+    SOURCE_DATE_EPOCH if set; else the date of the last commit touching
+    paths, if none of them has uncommitted changes; else the newest mtime.
+    Timestamps are read in UTC, so every machine stamps the same date.
+    """
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+    paths = [p for p in paths if os.path.exists(p)]
+    if not paths:
+        return datetime.now(timezone.utc)
+    try:
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", *paths], capture_output=True,
+                               text=True, check=True).stdout
+        if not dirty.strip():
+            last = subprocess.run(["git", "log", "-1", "--format=%ct", "--", *paths], capture_output=True,
+                                  text=True, check=True).stdout.strip()
+            if last:
+                return datetime.fromtimestamp(int(last), tz=timezone.utc)
+    except (OSError, subprocess.CalledProcessError):
+        pass  # not a git checkout
+    return datetime.fromtimestamp(max(os.path.getmtime(p) for p in paths), tz=timezone.utc)
+
+
+def file_digest(path):
+    """SHA-256 of a file's bytes, or None if it does not exist"""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def new_bibtex_parser():
+    """Create a BibTeX parser with the settings used by the site"""
+    parser = BibTexParser(common_strings=True)
+    parser.ignore_nonstandard_types = True
+    return parser
+
+
+BIB_ENTRY_START = re.compile(r'@\s*(\w+)\s*([{(])\s*([^,\s]*)')
+BIB_DELIMITERS = {'{': re.compile(r'[{}]'), '(': re.compile(r'[()]')}
+BIB_NON_ENTRY_TYPES = ('string', 'comment', 'preamble')
+
+
+def scan_bib_blocks(text, final=True):
+    """Split BibTeX source into (type, key, block) tuples at brace depth 0.
+
+    Returns the blocks and the offset where scanning stopped. Unless final is
+    set, a block still open at the end of text is left for the next call.
+    """
+    blocks = []
+    pos = 0
+    while True:
+        at = text.find('@', pos)
+        if at < 0:
+            return blocks, len(text)
+        match = BIB_ENTRY_START.match(text, at)
+        if not match:
+            if not final and '\n' not in text[at:]:
+                return blocks, at
+            pos = at + 1
+            continue
+        opening = match.group(2)
+        depth = 0
+        end = None
+        for delim in BIB_DELIMITERS[opening].finditer(text, match.start(2)):
+            if delim.group() == opening:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    end = delim.end()
+                    break
+        if end is None:
+            if not final:
+                return blocks, at
+            end = len(text)
+        blocks.append((match.group(1).lower(), match.group(3), text[at:end]))
+        pos = end
+
+
+def parse_bib_blocks(prelude, blocks):
+    """Parse several entry blocks in one parser run and map results back to blocks"""
+    parsed = bibtexparser.loads(prelude + "\n".join(b[2] for b in blocks),
+                                parser=new_bibtex_parser()).entries
+    results = []
+    index = 0
+    for _, key, _ in blocks:
+        if index < len(parsed) and parsed[index].get('ID') == key:
+            results.append(Publication.from_entry(parsed[index]))
+            index += 1
+        else:
+            results.append(None)
+    return results
+
+
+class Publication:
+    """One BibTeX entry, reduced to the fields the generators read
+
+    Read like the bibtexparser dict it comes from, with get(), [] and `in`;
+    a field the entry does not set is absent. Other fields are dropped, so a
+    field a generator starts using must be added to __slots__. Fields whose
+    values repeat across entries (type, year, venue, keywords) are interned.
+    """
+    __slots__ = ('ID', 'ENTRYTYPE', 'title', 'author', 'year', 'journal', 'booktitle', 'volume', 'number',
+                 'pages', 'keywords', 'note', 'doi', 'url', 'eprint', 'eprinttype', 'archiveprefix',
+                 'arxiv', 'preprint')
+    FIELDS = frozenset(__slots__)
+    INTERNED = ('ENTRYTYPE', 'year', 'journal', 'booktitle', 'keywords', 'eprinttype', 'archiveprefix')
+
+    @classmethod
+    def from_entry(cls, entry):
+        record = cls()
+        for field, value in entry.items():
+            if field in cls.FIELDS:
+                setattr(record, field, value)
+        for field in cls.INTERNED:
+            value = getattr(record, field, None)
+            if value is not None:
+                setattr(record, field, sys.intern(value))
+        return record
+
+    def get(self, field, default=None):
+        value = getattr(self, field, None) if field in self.FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, field):
+        value = self.get(field)
+        if value is None:
+            raise KeyError(field)
+        return value
+
+    def __contains__(self, field):
+        return self.get(field) is not None
+
+    def __getstate__(self):
+        return tuple(getattr(self, field, None) for field in self.__slots__)
+
+    def __setstate__(self, state):
+        for field, value in zip(self.__slots__, state):
+            if value is not None:
+                setattr(self, field, value)
+
+    def __repr__(self):
+        return f"Publication({self.get('ID')!r})"
+
+
+class BibCache:
+    """On-disk snapshot of parsed BibTeX entries, invalidated per entry"""
+    VERSION = 2
+
+    def __init__(self, config):
+        self.path = os.path.join(config['CACHE_DIR'], "bibtex.pickle")
+        self.stats = {'hits': 0, 'misses': 0, 'bytes': 0}
+        # Last snapshot and its size on disk, kept so a long-running process does not re-read it
+        self.snapshot = None
+        self.snapshot_bytes = 0
+
+    def read_snapshot(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            snapshot = pickle.loads(data)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get('version') != self.VERSION:
+            return None
+        self.snapshot_bytes = len(data)
+        return snapshot
+
+    def write_snapshot(self, snapshot):
+        self.snapshot_bytes = self.stats['bytes'] = write_pickle(self.path, snapshot)
+        self.snapshot = snapshot
+
+    def load(self, text):
+        """Return parsed entries for text, re-parsing only the blocks that changed
+
+        self.stats describes this call only: entries reused and parsed, and
+        the size of the snapshot.
+        """
+        file_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        # Entries are keyed by content, so a snapshot kept in memory is never wrong, at worst incomplete
+        snapshot = self.snapshot or self.read_snapshot()
+        self.snapshot = snapshot
+        self.stats = {'hits': 0, 'misses': 0, 'bytes': self.snapshot_bytes if snapshot else 0}
+        if snapshot and snapshot['file_hash'] == file_hash:
+            entries = [snapshot['entries'][h] for h in snapshot['order']]
+            entries = [e for e in entries if e is not None]
+            self.stats['hits'] = len(entries)
+            return entries
+
+        blocks, _ = scan_bib_blocks(text)
+        # @string definitions affect how every other entry is parsed
+        prelude = "\n".join(b[2] for b in blocks if b[0] == 'string')
+        prelude_hash = hashlib.sha256(prelude.encode("utf-8")).hexdigest()
+        blocks = [b for b in blocks if b[0] not in BIB_NON_ENTRY_TYPES]
+
+        cached = snapshot['entries'] if snapshot else {}
+        order = [hashlib.sha256((prelude_hash + b[2]).encode("utf-8")).hexdigest() for b in blocks]
+        missing = [(h, b) for h, b in zip(order, blocks) if h not in cached]
+        self.stats['hits'] = len(blocks) - len(missing)
+        self.stats['misses'] = len(missing)
+
+        entries = {h: cached[h] for h in order if h in cached}
+        if missing:
+            parsed = parse_bib_blocks(prelude + "\n", [b for _, b in missing])
+            for (h, _), entry in zip(missing, parsed):
+                entries[h] = entry
+
+        self.write_snapshot({
+            'version': self.VERSION,
+            'file_hash': file_hash,
+            'order': order,
+            'entries': entries,
+        })
+        return [entries[h] for h in order if entries[h] is not None]
+
+
+def split_authors(authors_str):
+    """Split a BibTeX author field into individual names"""
+    return [a.strip() for a in authors_str.split(" and ") if a.strip()]
+
+
+class AuthorIndex:
+    """Normalised author identities, built once per build and shared by all sections
+
+    Keys and rendered HTML are cached per author string. With limit, each
+    cache is emptied when it reaches limit entries, so memory does not grow
+    with the number of distinct authors (streaming builds). add_entry also
+    counts the publications of each author key.
+    """
+    def __init__(self, normalize, self_variants, limit=None):
+        self.normalize = normalize
+        self.limit = limit
+        self.keys = {}
+        self.html = {}
+        self.counts = Counter()
+        self.self_keys = frozenset(self.key(variant) for variant in self_variants)
+
+    def remember(self, cache, author, value):
+        if self.limit and len(cache) >= self.limit:
+            cache.clear()
+        cache[author] = value
+        return value
+
+    def key(self, author):
+        """Interned matching key for an author string"""
+        key = self.keys.get(author)
+        if key is None:
+            key = self.remember(self.keys, author, sys.intern(self.normalize(author)))
+        return key
+
+    def is_self(self, author):
+        return self.key(author) in self.self_keys
+
+    def add_entry(self, entry):
+        """Compute the matching key of each author of entry and count the publication"""
+        self.counts.update({self.key(author) for author in split_authors(entry.get("author", ""))})
+
+    def publication_count(self, author):
+        """Number of added entries listing author, under any spelling with the same key"""
+        return self.counts[self.key(author)]
+
+    def co_authors(self):
+        """Publication count of each author key other than the site owner's"""
+        return {key: count for key, count in self.counts.items() if key not in self.self_keys}
+
+    def render(self, author):
+        """Display HTML for an author, underlined and bold when it is the site owner"""
+        html = self.html.get(author)
+        if html is None:
+            # Use full Unicode for display
+            html = latex_to_html(re.sub(r'\\textbf\{([^}]*)\}', r'\1', author))
+            if self.is_self(author):
+                html = f'<u><strong>{html}</strong></u>'
+            self.remember(self.html, author, html)
+        return html
+
+
+class PublicationIndex:
+    """Array-backed columns describing the loaded publications, one row per entry.
+
+    Labels (years, types, domains, author keys) are stored once in a pool per
+    column and rows refer to them by id. Pools keep first-appearance order, so
+    count_by and group_by return dicts ordered like a scan over the entries.
+    """
+    COLUMNS = ('year', 'type', 'domain')
+
+    def __init__(self):
+        self.pools = {name: [] for name in self.COLUMNS + ('author',)}
+        self.ids = {name: {} for name in self.pools}
+        self.columns = {name: array('I') for name in self.COLUMNS}
+        self.author_ids = array('I')
+        self.author_offsets = array('I', [0])
+
+    def __len__(self):
+        return len(self.author_offsets) - 1
+
+    def intern(self, column, label):
+        ids = self.ids[column]
+        label_id = ids.get(label)
+        if label_id is None:
+            label_id = ids[label] = len(self.pools[column])
+            self.pools[column].append(label)
+        return label_id
+
+    def add(self, year, pub_type, domain, authors):
+        self.columns['year'].append(self.intern('year', year))
+        self.columns['type'].append(self.intern('type', pub_type))
+        self.columns['domain'].append(self.intern('domain', domain))
+        self.author_ids.extend(self.intern('author', author) for author in authors)
+        self.author_offsets.append(len(self.author_ids))
+
+    def label(self, column, row):
+        return self.pools[column][self.columns[column][row]]
+
+    def count_by(self, column):
+        """Number of rows for each label of column"""
+        counts = [0] * len(self.pools[column])
+        for label_id in self.columns[column]:
+            counts[label_id] += 1
+        return dict(zip(self.pools[column], counts))
+
+    def group_by(self, column):
+        """Row numbers for each label of column, in entry order"""
+        groups = [[] for _ in self.pools[column]]
+        for row, label_id in enumerate(self.columns[column]):
+            groups[label_id].append(row)
+        return dict(zip(self.pools[column], groups))
+
+    def authors(self, row):
+        """Author keys of row, in entry order"""
+        pool = self.pools['author']
+        return [pool[i] for i in self.author_ids[self.author_offsets[row]:self.author_offsets[row + 1]]]
+
+    def rows_where(self, **labels):
+        """Row numbers, in entry order, matching every column=label given
+
+        A row matches author=key when key is one of its authors.
+        """
+        rows = range(len(self))
+        for column, label in labels.items():
+            label_id = self.ids[column].get(label)
+            if label_id is None:
+                return []
+            if column == 'author':
+                ids, offsets = self.author_ids, self.author_offsets
+                rows = [row for row in rows if label_id in ids[offsets[row]:offsets[row + 1]]]
+            else:
+                values = self.columns[column]
+                rows = [row for row in rows if values[row] == label_id]
+        return list(rows)
+
+    def nbytes(self):
+        """Approximate memory used by the arrays and the label pools"""
+        arrays = list(self.columns.values()) + [self.author_ids, self.author_offsets]
+        size = sum(a.itemsize * len(a) for a in arrays)
+        return size + sum(sys.getsizeof(label) for pool in self.pools.values() for label in pool)
+
+
+class BibliographyIndex:
+    """Parsed entries of one BibTeX file with their PublicationIndex.
+
+    Built once and shared by every site listing publications from the same
+    file, so each site's own publications are looked up in the author
+    column instead of normalising every author again.
+    """
+    def __init__(self, entries, generator):
+        self.entries = entries
+        self.index = generator.index_publications(entries)
+
+    def select_rows(self, authors, normalize):
+        """Rows, in file order, of the entries with any of the authors"""
+        found = set()
+        for key in {normalize(author) for author in authors}:
+            found.update(self.index.rows_where(author=key))
+        return sorted(found)
+
+    def select(self, authors, normalize):
+        return [self.entries[row] for row in self.select_rows(authors, normalize)]
+
+
+class PublicationSpool:
+    """Rendered publication HTML kept in temporary files, one per year"""
+    def __init__(self):
+        self.files = {}
+
+    @property
+    def years(self):
+        return list(self.files)
+
+    def add(self, year, html):
+        if year not in self.files:
+            self.files[year] = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+        self.files[year].write("\n" + html)
+
+    def read_year(self, year):
+        f = self.files[year]
+        f.seek(0)
+        return f.read()
+
+    def copy_year(self, year, out):
+        f = self.files[year]
+        f.seek(0)
+        shutil.copyfileobj(f, out)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+
+
+class FragmentCache:
+    """Rendered section HTML kept on disk, keyed by a hash of the section's inputs"""
+    VERSION = 2
+
+    def __init__(self, config):
+        self.path = os.path.join(config['CACHE_DIR'], "fragments.pickle")
+        self.fragments = None
+
+    def load(self):
+        if self.fragments is None:
+            try:
+                with open(self.path, "rb") as f:
+                    version, self.fragments = pickle.load(f)
+                if version != self.VERSION:
+                    self.fragments = {}
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+                self.fragments = {}
+        return self.fragments
+
+    def lookup(self, keys):
+        """Cached HTML and extra output files for every section whose key still matches"""
+        fragments = self.load()
+        sections = {}
+        outputs = {}
+        for name, key in keys.items():
+            if name in fragments and fragments[name][0] == key:
+                _, html, files = fragments[name]
+                # A section that points to fragment files is only valid while they exist
+                if all(os.path.exists(f) for f in files):
+                    sections[name] = html
+                    outputs[name] = files
+        return sections, outputs
+
+    def store(self, keys, sections, outputs):
+        fragments = self.load()
+        for name, key in keys.items():
+            if isinstance(sections.get(name), str):
+                fragments[name] = (key, sections[name], outputs.get(name, []))
+        write_pickle(self.path, (self.VERSION, fragments))
+
+
+class YearFragments:
+    """Writes the hidden years of one section to OUTPUT_DIR/fragments/ under content-hashed names"""
+    FOLDER = "fragments"
+
     def __init__(self, config):
+        self.dir = os.path.join(config['OUTPUT_DIR'], self.FOLDER)
+        self.minify = config.get('MINIFY')
+        self.written = []
+        self.source_sizes = {}
+
+    def __call__(self, name, html):
+        """Store html as fragment name and return its URL relative to index.html"""
+        source_size = len(html.encode("utf-8"))
+        if self.minify:
+            html = minify_html(html)
+        digest = hashlib.sha256(html.encode("utf-8")).hexdigest()[:8]
+        filename = f"{name}.{digest}.html"
+        path = os.path.join(self.dir, filename)
+        if not os.path.exists(path):
+            os.makedirs(self.dir, exist_ok=True)
+            atomic_write(path, lambda tmp: write_bytes(tmp, html.encode("utf-8")))
+        self.written.append(path)
+        self.source_sizes[f"{self.FOLDER}/{filename}"] = source_size
+        return f"{self.FOLDER}/{filename}"
+
+
+def lazy_year_attr(src):
+    return f' data-src="{src}"' if src else ''
+
+
+def year_open_html(tab_id, content_class, active, src=None):
+    """Opening <div> of one year's tab panel; src is the fragment URL of a lazy year"""
+    display_style = "block" if active else "none"
+    return f'<div id="{tab_id}" class="{content_class}" style="display:{display_style}"{lazy_year_attr(src)}>'
+
+
+class Section:
+    """Registry entry a generator declares for the part of the page it renders
+
+    name is used by LAZY_YEARS and the build log, slots are the template
+    slots it fills, inputs the CONFIG keys of the files it reads and config
+    the other CONFIG keys its renderer reads; only those are part of the
+    section's fragment cache key. lazy is
+    the slot whose hidden years can go to fragment files, and dated sections
+    also depend on today's date, which the builder sets once per build as
+    the generator's today attribute; their generator also implements
+    next_change(today), the first later date on which its output differs
+    (None if it never does). The generator implements
+    load_section(span, streaming) and render_section(data, span, lazy,
+    streaming), which returns {slot: html, or a function writing it to a
+    file}. Loads run concurrently with other sections' loads, and renders
+    with their renders, so neither may use another section's data.
+    """
+    def __init__(self, name, slots, inputs=(), lazy=None, dated=False, config=()):
+        self.name = name
+        self.slots = slots
+        self.inputs = inputs
         self.config = config
-        
+        self.lazy = lazy
+        self.dated = dated
+
+
+class PublicationGenerator:
+    SECTION = Section('publications', ('STATS_PANEL', 'PUBLICATIONS'), ('BIB_FILE',), lazy='PUBLICATIONS',
+                      config=('FILTER_BY_AUTHOR', 'AUTHOR_VARIANTS', 'DOMAIN_MAP'))
+    # Author strings whose key and HTML are kept at a time in streaming mode
+    STREAMING_AUTHOR_CACHE = 4096
+
+    def __init__(self, config, bibliographies=None):
+        self.config = config
+        self.bib_cache = BibCache(config)
+        # BibliographyIndex of already parsed BibTeX files, by absolute path
+        self.bibliographies = bibliographies or {}
+        self.author_index = self.new_author_index()
+
+    def load_section(self, span, streaming=False):
+        """Parse the bibliography and index it; in streaming mode also render it to a spool"""
+        if streaming:
+            with span("parse, count and spool"):
+                stats, spool = self.spool_publications(self.iter_bibtex(), color_coded=True)
+            return {'stats': stats, 'spool': spool}
+        with span("load bibtex"):
+            bib_db = self.load_bibtex()
+        with span("author index"):
+            self.build_author_index(bib_db.entries)
+        with span("publication index"):
+            index = self.index_publications(bib_db.entries)
+        with span("stats"):
+            stats = self.generate_stats(bib_db, index=index)
+        return {'bib_db': bib_db, 'index': index, 'stats': stats}
+
+    def render_section(self, data, span, lazy=None, streaming=False):
+        sections = {'STATS_PANEL': self.generate_stats_html(data['stats'])}
+        if streaming:
+            sections['PUBLICATIONS'] = lambda out: self.write_publications_html(
+                data['spool'], out, color_coded=True, lazy=lazy)
+        else:
+            sections['PUBLICATIONS'] = self.generate_publications_html(
+                data['bib_db'], color_coded=True, index=data['index'], lazy=lazy)
+        return sections
+
+    def new_author_index(self, limit=None):
+        return AuthorIndex(self.normalize_author_for_matching, self.config.get('AUTHOR_VARIANTS', []), limit)
+
+    def build_author_index(self, entries):
+        """Rebuild the author index with the keys of every author of entries"""
+        self.author_index = self.new_author_index()
+        for entry in entries:
+            self.author_index.add_entry(entry)
+        return self.author_index
+
     def load_bibtex(self):
-        """Load and parse BibTeX file"""
+        """Load and parse BibTeX file, reusing cached entries when possible"""
+        index = self.bibliographies.get(os.path.abspath(self.config['BIB_FILE']))
+        if index is None:
+            entries = self.read_bibtex_entries()
+            if entries is None:
+                return bibtexparser.loads('')
+            if not self.config.get('FILTER_BY_AUTHOR'):
+                bib_db = BibDatabase()
+                bib_db.entries = entries
+                return bib_db
+            index = BibliographyIndex(entries, self)
+
+        bib_db = BibDatabase()
+        if self.config.get('FILTER_BY_AUTHOR'):
+            bib_db.entries = index.select(self.config['AUTHOR_VARIANTS'], self.normalize_author_for_matching)
+        else:
+            bib_db.entries = list(index.entries)
+        return bib_db
+
+    def read_bibtex_entries(self):
+        """All entries of BIB_FILE through the BibTeX cache, or None if the file is missing"""
         try:
-            parser = BibTexParser(common_strings=True)
-            parser.ignore_nonstandard_types = True
             with open(self.config['BIB_FILE'], encoding="utf-8") as f:
-                return bibtexparser.load(f, parser=parser)
+                text = f.read()
         except FileNotFoundError:
             print(f"⚠️ BibTeX file not found: {self.config['BIB_FILE']}")
-            return bibtexparser.loads('')
-    
-    def generate_stats(self, bib_db):
+            return None
+        return self.bib_cache.load(text)
+
+    def is_listed(self, entry):
+        """Whether entry belongs on this site (see FILTER_BY_AUTHOR)"""
+        if not self.config.get('FILTER_BY_AUTHOR'):
+            return True
+        return any(self.author_index.is_self(author) for author in split_authors(entry.get("author", "")))
+
+    def iter_bibtex(self, batch_size=256, chunk_size=1 << 16):
+        """Yield BibTeX entries one at a time without loading the whole file"""
+        try:
+            f = open(self.config['BIB_FILE'], encoding="utf-8")
+        except FileNotFoundError:
+            print(f"⚠️ BibTeX file not found: {self.config['BIB_FILE']}")
+            return
+
+        prelude = ""
+        batch = []
+        buffer = ""
+        with f:
+            while True:
+                chunk = f.read(chunk_size)
+                buffer += chunk
+                blocks, pos = scan_bib_blocks(buffer, final=not chunk)
+                buffer = buffer[pos:]
+                for block in blocks:
+                    if block[0] == 'string':
+                        prelude += block[2] + "\n"
+                    elif block[0] not in BIB_NON_ENTRY_TYPES:
+                        batch.append(block)
+                if batch and (len(batch) >= batch_size or not chunk):
+                    for entry in parse_bib_blocks(prelude, batch):
+                        if entry is not None and self.is_listed(entry):
+                            yield entry
+                    batch = []
+                if not chunk:
+                    break
+
+    def index_publications(self, entries):
+        """Build the columnar publication index shared by stats, tabs and rendering"""
+        index = PublicationIndex()
+        for entry in entries:
+            index.add(entry.get("year", "Unknown"),
+                      self.get_publication_type(entry),
+                      self.get_domain(entry),
+                      [self.author_index.key(a) for a in split_authors(entry.get("author", ""))])
+        return index
+
+    def get_domain(self, entry):
+        """Display name of the entry's research domain (first keyword)"""
+        domain = "other"
+        if "keywords" in entry:
+            domain = entry["keywords"].split(",")[0].strip().lower()
+        return self.config['DOMAIN_MAP'].get(domain, domain.title())
+
+    def generate_stats(self, bib_db, index=None):
         """Generate publication statistics"""
-        stats = {
-            'total_publications': len(bib_db.entries),
-            'years': {},
-            'domains': {}
+        if index is None:
+            index = self.index_publications(bib_db.entries)
+        return {
+            'total_publications': len(index),
+            'years': index.count_by('year'),
+            'domains': index.count_by('domain'),
+            'co_authors': len(self.author_index.co_authors())
         }
-        
-        for entry in bib_db.entries:
-            year = entry.get("year", "Unknown")
-            stats['years'][year] = stats['years'].get(year, 0) + 1
-            
-            domain = "other"
-            if "keywords" in entry:
-                domain = entry["keywords"].split(",")[0].strip().lower()
-            domain_display = self.config['DOMAIN_MAP'].get(domain, domain.title())
-            stats['domains'][domain_display] = stats['domains'].get(domain_display, 0) + 1
-        
-        return stats
+
+    def count_entry(self, stats, entry):
+        """Add one entry to the publication statistics"""
+        stats['total_publications'] += 1
+        year = entry.get("year", "Unknown")
+        stats['years'][year] = stats['years'].get(year, 0) + 1
+        domain_display = self.get_domain(entry)
+        stats['domains'][domain_display] = stats['domains'].get(domain_display, 0) + 1
     
     def get_publication_type(self, entry):
         """Determine publication type"""
@@ -117,18 +1009,17 @@ class PublicationGenerator:
         # Use booktitle for conferences, journal for articles
         raw_venue = journal if journal else booktitle
         
-        # Convert LaTeX accents to Unicode
-        venue = self.latex_to_unicode(raw_venue)
-        
         # Append volume, number, pages if available
+        details = ""
         if "volume" in entry:
-            venue += f", {entry['volume']}"
+            details += f", {entry['volume']}"
             if "number" in entry:
-                venue += f"({entry['number']})"
+                details += f"({entry['number']})"
         if "pages" in entry:
-            venue += f", pp. {entry['pages']}"
+            details += f", pp. {entry['pages']}"
         
-        return sanitize_html(venue)
+        # Convert LaTeX accents to Unicode
+        return cached_latex_to_html(raw_venue) + sanitize_html(details)
     
     def build_link_icons(self, entry):
         """Generate publication link icons with colorblind-friendly design"""
@@ -213,72 +1104,75 @@ class PublicationGenerator:
         return ' '.join(parts)
 
     def latex_to_unicode(self, text):
-        """Convert common LaTeX accent commands to Unicode characters (including in titles)."""
-        if not text:
-            return text
-    
-        # Helper for accents
-        def replace_accent(match):
-            cmd, char = match.groups()
-            if cmd == "'":
-                return {'a': 'á', 'e': 'é', 'i': 'í', 'o': 'ó', 'u': 'ú',
-                        'A': 'Á', 'E': 'É', 'I': 'Í', 'O': 'Ó', 'U': 'Ú'}.get(char, char)
-            elif cmd == "`":
-                return {'a': 'à', 'e': 'è'}.get(char, char)
-            elif cmd == '"':
-                return {'a': 'ä', 'e': 'ë', 'i': 'ï', 'o': 'ö', 'u': 'ü'}.get(char, char)
-            elif cmd == "~":
-                return {'n': 'ñ', 'N': 'Ñ'}.get(char, char)
-            elif cmd == "^":  # ← Añadido: circumflex
-                return {'a': 'â', 'e': 'ê', 'i': 'î', 'o': 'ô', 'u': 'û',
-                        'A': 'Â', 'E': 'Ê', 'I': 'Î', 'O': 'Ô', 'U': 'Û'}.get(char, char)
-            return char
-    
-        # Replace \cmd{char} and \cmd char
-        text = re.sub(r"\\([`'\"~^])\{([aeiouAEIOU])\}", replace_accent, text)
-        text = re.sub(r"\\([`'\"~^])([aeiouAEIOU])", replace_accent, text)
-        # Cedilla
-        text = re.sub(r"\\c\{([cC])\}", lambda m: 'ç' if m.group(1) == 'c' else 'Ç', text)
-        # Remove protection braces
-        text = text.replace('{', '').replace('}', '')
-        return text
+        """Convert LaTeX accent commands to Unicode characters (including in titles)."""
+        return latex_to_unicode(text)
     
     def process_authors(self, authors_str):
         """Process and highlight authors with proper LaTeX-to-Unicode conversion."""
         if not authors_str:
             return ""
         
-        author_list = [a.strip() for a in authors_str.split(" and ") if a.strip()]
-        normalized_variants = {
-            self.normalize_author_for_matching(var) for var in self.config.get('AUTHOR_VARIANTS', [])
-        }
-        
-        highlighted = []
-        for author in author_list:
-            # Use full Unicode for display
-            display_name = re.sub(r'\\textbf\{([^}]*)\}', r'\1', author)
-            display_name = self.latex_to_unicode(display_name)
-            
-            # Normalize for comparison (accent-insensitive)
-            normalized = self.normalize_author_for_matching(author)
-            is_me = normalized in normalized_variants
-            
-            if is_me:
-                highlighted.append(f'<u><strong>{sanitize_html(display_name)}</strong></u>')
-            else:
-                highlighted.append(sanitize_html(display_name))
-        
-        return ", ".join(highlighted)
+        return ", ".join(self.author_index.render(author) for author in split_authors(authors_str))
     
-    def generate_publications_html(self, bib_db, color_coded=True):
+    def generate_publications_html(self, bib_db, color_coded=True, index=None, lazy=None):
         """Generate HTML for publications"""
-        entries_by_year = defaultdict(list)
-        for entry in bib_db.entries:
-            year = entry.get("year", "Unknown")
-            entries_by_year[year].append(entry)
+        return "\n".join(self.iter_publications_html(bib_db, color_coded, index, lazy))
+
+    def iter_publications_html(self, bib_db, color_coded=True, index=None, lazy=None):
+        """Yield the publications HTML fragment by fragment.
+
+        If lazy is given (see YearFragments), every year but the first is
+        passed to it and left as an empty container pointing to the fragment.
+        """
+        if index is None:
+            index = self.index_publications(bib_db.entries)
+        rows_by_year = index.group_by('year')
 
-        years = sorted(entries_by_year.keys(), reverse=True)
+        years = sorted(rows_by_year.keys(), reverse=True)
+        
+        yield from self.publications_header(years, color_coded)
         
+        for i, year in enumerate(years):
+            rendered = (self.render_publication(bib_db.entries[row], color_coded,
+                                                pub_type=index.label('type', row))
+                        for row in rows_by_year[year])
+            if lazy and i > 0:
+                yield self.year_open_html(year, False, src=lazy(f"pub-{year}", "\n".join(rendered)))
+            else:
+                yield self.year_open_html(year, i == 0)
+                yield from rendered
+            
+            yield '</div>'
+
+        yield '</div>'
+
+    def spool_publications(self, entries, color_coded=True):
+        """Consume an entry stream once, collecting stats and rendered HTML per year"""
+        stats = {'total_publications': 0, 'years': {}, 'domains': {}}
+        spool = PublicationSpool()
+        self.author_index = self.new_author_index(limit=self.STREAMING_AUTHOR_CACHE)
+        for entry in entries:
+            self.count_entry(stats, entry)
+            spool.add(entry.get("year", "Unknown"), self.render_publication(entry, color_coded))
+        return stats, spool
+
+    def write_publications_html(self, spool, out, color_coded=True, lazy=None):
+        """Write spooled publications to out, matching generate_publications_html"""
+        years = sorted(spool.years, reverse=True)
+        parts = self.publications_header(years, color_coded)
+        out.write("\n".join(parts))
+        for i, year in enumerate(years):
+            if lazy and i > 0:
+                src = lazy(f"pub-{year}", spool.read_year(year)[1:])
+                out.write("\n" + self.year_open_html(year, False, src=src))
+            else:
+                out.write("\n" + self.year_open_html(year, i == 0))
+                spool.copy_year(year, out)
+            out.write("\n</div>")
+        out.write("\n</div>")
+
+    def publications_header(self, years, color_coded=True):
+        """HTML parts preceding the per-year publication lists"""
         html = ['<div class="publications-container">']
         
         if color_coded:
@@ -306,31 +1200,34 @@ class PublicationGenerator:
         html.append('<div class="publication-tabs">')
         for i, year in enumerate(years):
             active_class = " active" if i == 0 else ""
-            html.append(f'<button class="publication-tab{active_class}" data-year="{year}">{year}</button>')
+            html.append(f'<button class="publication-tab{active_class}" data-year="{year}" data-tab="pub-{year}">{year}</button>')
         html.append('</div>')
+        return html
+
+    def year_open_html(self, year, active, src=None):
+        return year_open_html(f"pub-{year}", "publication-content", active, src)
+
+    def render_publication(self, entry, color_coded=True, pub_type=None):
+        """Render a single publication entry"""
+        if not color_coded:
+            pub_type = None
+        elif pub_type is None:
+            pub_type = self.get_publication_type(entry)
+#         title = sanitize_html(entry.get("title", "Untitled"))
+        raw_title = entry.get("title", "Untitled")
+        title = latex_to_html(raw_title)
+
+        authors = self.process_authors(entry.get("author", ""))
+        venue = self.build_venue_string(entry)
+        link_icons = self.build_link_icons(entry)
         
-        for i, year in enumerate(years):
-            display_style = "block" if i == 0 else "none"
-            html.append(f'<div id="pub-{year}" class="publication-content" style="display:{display_style}">')
-            
-            for entry in entries_by_year[year]:
-                pub_type = self.get_publication_type(entry) if color_coded else None
-#                 title = sanitize_html(entry.get("title", "Untitled"))
-                raw_title = entry.get("title", "Untitled")
-                clean_title = self.latex_to_unicode(raw_title)
-                title = sanitize_html(clean_title)
-
-                authors = self.process_authors(entry.get("author", ""))
-                venue = self.build_venue_string(entry)
-                link_icons = self.build_link_icons(entry)
-                
-                color_indicator = f'<span class="color-indicator {pub_type}"></span>' if color_coded and pub_type else ''
-                
-                icons_html = ""
-                if link_icons:
-                    icons_html = f'<span class="title-icons-container">{"".join(link_icons)}</span>'
-                
-                html.append(f'''
+        color_indicator = f'<span class="color-indicator {pub_type}"></span>' if color_coded and pub_type else ''
+        
+        icons_html = ""
+        if link_icons:
+            icons_html = f'<span class="title-icons-container">{"".join(link_icons)}</span>'
+        
+        return f'''
                 <div class="publication">
                     <div class="publication-header">
                         {color_indicator}
@@ -342,17 +1239,19 @@ class PublicationGenerator:
                         <div class="publication-venue">{venue}</div>
                     </div>
                 </div>
-                ''')
-            
-            html.append('</div>')
-
-        html.append('</div>')
-        return "\n".join(html)
+                '''
     
     def generate_stats_html(self, stats):
         """Generate statistics panel HTML"""
         top_domains = sorted(stats['domains'].items(), key=lambda x: x[1], reverse=True)[:3]
-        
+        co_authors_html = ""
+        if 'co_authors' in stats:
+            co_authors_html = f"""
+                <div class="stat">
+                    <div class="stat-value">{stats['co_authors']}</div>
+                    <div class="stat-label">Co-authors</div>
+                </div>"""
+
         return f"""
         <aside class="stats-panel">
             <h3>Research Metrics</h3>
@@ -368,188 +1267,970 @@ class PublicationGenerator:
                 <div class="stat">
                     <div class="stat-value">{top_domains[0][1] if top_domains else 0}</div>
                     <div class="stat-label">{top_domains[0][0] if top_domains else 'N/A'}</div>
-                </div>
+                </div>{co_authors_html}
             </div>
         </aside>
         """
-    
-    def add_tab_script(self):
-        """Add JavaScript for tab functionality (solo para publicaciones internas)"""
-        return """
-        <script>
-        // Solo para pestañas de publicaciones
-        document.addEventListener('DOMContentLoaded', function() {
-            const pubTabs = document.querySelectorAll('.publication-tab');
-            pubTabs.forEach(tab => {
-                tab.addEventListener('click', function() {
-                    const year = this.getAttribute('data-year');
-                    
-                    // Hide all publication contents
-                    document.querySelectorAll('.publication-content').forEach(content => {
-                        content.style.display = 'none';
-                    });
-                    
-                    // Remove active class from all publication tabs
-                    pubTabs.forEach(t => t.classList.remove('active'));
-                    
-                    // Show selected content and mark tab as active
-                    document.getElementById('pub-' + year).style.display = 'block';
-                    this.classList.add('active');
-                });
-            });
-            
-            // Para pestañas de cursos
-            const courseTabs = document.querySelectorAll('.course-tab');
-            courseTabs.forEach(tab => {
-                tab.addEventListener('click', function() {
-                    const year = this.getAttribute('data-year');
-                    
-                    // Hide all course contents
-                    document.querySelectorAll('.course-content').forEach(content => {
-                        content.style.display = 'none';
-                    });
-                    
-                    // Remove active class from all course tabs
-                    courseTabs.forEach(t => t.classList.remove('active'));
-                    
-                    // Show selected content and mark tab as active
-                    document.getElementById('courses-' + year).style.display = 'block';
-                    this.classList.add('active');
-                });
-            });
-            
-            // Para pestañas de presentaciones
-            const presTabs = document.querySelectorAll('.presentation-tab');
-            presTabs.forEach(tab => {
-                tab.addEventListener('click', function() {
-                    const year = this.getAttribute('data-year');
-                    
-                    // Hide all presentation contents
-                    document.querySelectorAll('.presentation-content').forEach(content => {
-                        content.style.display = 'none';
-                    });
-                    
-                    // Remove active class from all presentation tabs
-                    presTabs.forEach(t => t.classList.remove('active'));
-                    
-                    // Show selected content and mark tab as active
-                    document.getElementById('presentations-' + year).style.display = 'block';
-                    this.classList.add('active');
-                });
-            });
-        });
-        </script>
-        """
 
 
-class TeachingGenerator:
-    def __init__(self, config):
-        self.config = config
-    
-    def load_courses(self):
-        """Load courses data from CSV"""
-        courses_by_year = {}
-        
-        try:
-            with open(self.config['COURSES_CSV'], mode='r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
+# String and template literals (group 1), block comments and whole-line // comments
+JS_TOKEN = re.compile(r'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`)'
+                      r'|/\*.*?\*/|^[ \t]*//[^\n]*', re.S | re.M)
+JS_LINE_BREAK = re.compile(r'[ \t]*\n\s*')
+
+
+def minify_js(text):
+    """Drop comments, indentation and blank lines from hand-written JavaScript.
+
+    Only whole-line // comments are removed, so URLs containing // are left
+    alone, and string and template literals are kept as they are; line
+    breaks are kept so automatic semicolon insertion still applies.
+    """
+    out = []
+    code = ""
+    pos = 0
+    for m in JS_TOKEN.finditer(text):
+        code += text[pos:m.start()]
+        pos = m.end()
+        if m.group(1):
+            out.append(JS_LINE_BREAK.sub("\n", code) + m.group(1))
+            code = ""
+    out.append(JS_LINE_BREAK.sub("\n", code + text[pos:]))
+    return "".join(out).strip() + "\n"
+
+
+CSS_TOKEN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*|:\s+')
+
+
+def minify_css(text):
+    """Drop comments and redundant whitespace from CSS, leaving strings untouched"""
+    # Odd items are string literals once the comments are gone
+    pieces = CSS_TOKEN.split(CSS_TOKEN.sub(lambda m: m.group(1) or '', text))
+    for i in range(0, len(pieces), 2):
+        code = re.sub(r'\s+', ' ', pieces[i])
+        pieces[i] = CSS_PUNCTUATION.sub(lambda m: m.group(1) or ':', code).replace(';}', '}')
+    return "".join(pieces).strip() + "\n"
+
+
+# Attributes of a tag; a quoted value may contain '>'
+HTML_ATTRS = r'(?:"[^"]*"|\'[^\']*\'|[^\'">])*'
+HTML_RAW = re.compile(r'<!--(.*?)-->|<(pre|textarea|script|style)\b(' + HTML_ATTRS + r')>(.*?)</\2\s*>',
+                      re.S | re.I)
+HTML_RAW_START = re.compile(r'<!--|<(?:pre|textarea|script|style)\b', re.I)
+HTML_TAG = re.compile(r'<' + HTML_ATTRS + r'>')
+HTML_ATTR_SPACE = re.compile(r'("[^"]*"|\'[^\']*\')|\s+')
+
+
+def minify_html(html):
+    """Collapse whitespace in HTML without changing how it renders.
+
+    Comments are dropped (except IE conditional comments); <pre> and
+    <textarea> are kept as they are; inline scripts and styles go through
+    minify_js and minify_css. Whitespace runs between and inside tags are
+    reduced to one character (a newline if the run had one), and quoted
+    attribute values are never touched.
+    """
+    return _minify_html(html).strip() + "\n"
+
+
+def html_chunk_end(html):
+    """Length of the longest prefix of html that ends after a tag or a whole raw block.
+
+    Minifying such a prefix and the rest separately gives the same result
+    as minifying html in one go, since no tag, comment, <pre>/<textarea>/
+    <script>/<style> block or whitespace run is cut in two.
+    """
+    end = pos = 0
+    while True:
+        m = HTML_RAW_START.search(html, pos)
+        limit = m.start() if m else len(html)
+        for tag in HTML_TAG.finditer(html, pos, limit):
+            end = tag.end()
+        if m is None:
+            return end
+        raw = HTML_RAW.match(html, m.start())
+        if raw is None:
+            # Not closed yet; wait for more text
+            return end
+        end = pos = raw.end()
+
+
+class PageWriter:
+    """File-like wrapper that writes a page to out in chunks cut between tags.
+
+    Text is buffered until CHUNK characters are waiting, then the part up to
+    the last complete tag or raw block (see html_chunk_end) is passed to
+    names (a PageNames, if given) and written to out, minified if minify is
+    true. close() flushes the rest. The minified output is the same as
+    minify_html of all the text, while memory stays bounded by the chunk size
+    and the largest <pre>/<script>/<style> block. source_bytes counts the
+    UTF-8 size of the text before minification.
+    """
+    CHUNK = 1 << 16
+
+    def __init__(self, out, minify=True, names=None):
+        self.out = out
+        self.minify = minify
+        self.names = names
+        self.pending = []
+        self.size = 0
+        self.limit = self.CHUNK
+        self.source_bytes = 0
+        self.started = False
+        # Trailing whitespace, written only if more output follows
+        self.space = ""
+
+    def write(self, text):
+        self.pending.append(text)
+        self.size += len(text)
+        self.source_bytes += len(text.encode("utf-8"))
+        if self.size >= self.limit:
+            html = "".join(self.pending)
+            end = html_chunk_end(html)
+            self.emit(html[:end])
+            rest = html[end:]
+            self.pending, self.size = [rest], len(rest)
+            # An unfinished raw block is not rescanned on every write
+            self.limit = max(self.CHUNK, 2 * self.size)
+        return len(text)
+
+    def emit(self, html):
+        if self.names is not None:
+            self.names.add(html)
+        if not self.minify:
+            self.out.write(html)
+            return
+        html = _minify_html(html)
+        if not self.started:
+            html = html.lstrip()
+            self.started = bool(html)
+        body = html.rstrip()
+        if body:
+            self.out.write(self.space + body)
+            self.space = html[len(body):]
+        else:
+            self.space += html
+
+    def close(self):
+        self.emit("".join(self.pending))
+        self.pending, self.size = [], 0
+        if self.minify:
+            self.out.write("\n")
+
+
+def _minify_html(html):
+    out = []
+    pos = 0
+    for m in HTML_RAW.finditer(html):
+        out.append(_collapse_html(html[pos:m.start()]))
+        pos = m.end()
+        if m.group(2) is None:
+            if m.group(1).startswith('[if'):
+                out.append(m.group())
+            continue
+        tag = m.group(2).lower()
+        body = m.group(4)
+        if tag == 'script' and 'src=' not in m.group(3) and 'type=' not in m.group(3):
+            body = minify_js(body).rstrip("\n")
+        elif tag == 'style':
+            body = minify_css(body).rstrip("\n")
+        out.append(f'{_collapse_tag(html[m.start():m.start(4)])}{body}</{m.group(2)}>')
+    out.append(_collapse_html(html[pos:]))
+    return "".join(out)
+
+
+def _collapse_tag(tag):
+    return HTML_ATTR_SPACE.sub(lambda m: m.group(1) or ' ', tag)
+
+
+def _collapse_whitespace(text):
+    return re.sub(r'\s+', lambda m: "\n" if "\n" in m.group() else " ", text)
+
+
+def _collapse_html(html):
+    parts = []
+    pos = 0
+    for m in HTML_TAG.finditer(html):
+        parts.append(_collapse_whitespace(html[pos:m.start()]))
+        parts.append(_collapse_tag(m.group()))
+        pos = m.end()
+    parts.append(_collapse_whitespace(html[pos:]))
+    return "".join(parts)
+
+
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.svg', '.xml', '.txt')
+
+
+def precompress_file(path, formats, rejected=None):
+    """Write path.gz / path.br at maximum compression unless they are up to date; runs in a worker process
+
+    Copies that would not be smaller are not kept. Returns the sizes of the
+    copies and (content digest, formats not kept); passed back as rejected
+    for the same content, those formats are not compressed again.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    mtime = os.path.getmtime(path)
+    digest = hashlib.sha256(data).hexdigest()
+    skip = rejected[1] if rejected and rejected[0] == digest else ()
+    sizes = {}
+    dropped = []
+    for fmt in formats:
+        dest = f"{path}.{fmt}"
+        if fmt in skip:
+            dropped.append(fmt)
+            continue
+        if not os.path.exists(dest) or os.path.getmtime(dest) < mtime:
+            if fmt == "gz":
+                # mtime=0 keeps the .gz identical when the content is
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            else:
+                compressed = brotli.compress(data, quality=11)
+            if len(compressed) >= len(data):
+                # Not worth serving; tiny files can grow
+                if os.path.exists(dest):
+                    os.remove(dest)
+                dropped.append(fmt)
+                continue
+            atomic_write(dest, lambda tmp: write_bytes(tmp, compressed))
+        sizes[fmt] = os.path.getsize(dest)
+    return sizes, (digest, tuple(dropped))
+
+
+def fragment_writer(fragments):
+    """Slot value that writes fragments to the output as they are generated.
+
+    The result is the same as inserting "\\n".join(fragments), without
+    holding the joined section in memory.
+    """
+    def write(out):
+        separator = ""
+        for fragment in fragments:
+            out.write(separator)
+            out.write(fragment)
+            separator = "\n"
+    return write
+
+
+class CompiledTemplate:
+    """HTML template split once into literal segments and named <!-- SLOT --> placeholders"""
+    VERSION = 1
+    SLOT = re.compile(r'<!-- ([A-Z][A-Z0-9_]*) -->')
+    # Templates compiled by this process, by content hash
+    loaded = {}
+
+    def __init__(self, text, digest=None):
+        self.hash = digest or hashlib.sha256(text.encode("utf-8")).hexdigest()
+        parts = self.SLOT.split(text)
+        self.literals = parts[0::2]
+        self.slots = parts[1::2]
+
+    @classmethod
+    def load(cls, path, cache_dir=None):
+        """Read and compile a template, reusing a compiled copy cached by content hash"""
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if not cache_dir:
+            return cls(text)
+
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if digest in cls.loaded:
+            return cls.loaded[digest]
+        cache_path = os.path.join(cache_dir, f"template-{digest[:16]}.pickle")
+        try:
+            with open(cache_path, "rb") as f:
+                version, template = pickle.load(f)
+            if version == cls.VERSION and template.hash == digest:
+                cls.loaded[digest] = template
+                return template
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            pass
+
+        template = cls(text, digest)
+        write_pickle(cache_path, (cls.VERSION, template))
+        cls.loaded[digest] = template
+        return template
+
+    def write(self, out, values):
+        """Write the template to out, filling each slot from values.
+
+        A value may be a string or a callable that writes its content to out.
+        Slots without a value are written back unchanged.
+        """
+        out.write(self.literals[0])
+        for name, literal in zip(self.slots, self.literals[1:]):
+            value = values.get(name)
+            if value is None:
+                out.write(f"<!-- {name} -->")
+            elif callable(value):
+                value(out)
+            else:
+                out.write(value)
+            out.write(literal)
+
+    def with_replaced(self, pattern, text):
+        """Copy of the template with the first match of pattern replaced by text, or None if it has none"""
+        for i, literal in enumerate(self.literals):
+            if pattern.search(literal):
+                template = copy.copy(self)
+                template.literals = list(self.literals)
+                template.literals[i] = pattern.sub(lambda m: text, literal, count=1)
+                return template
+        return None
+
+    def with_assets(self, manifest, base_dir=""):
+        """Copy of the template with href/src references replaced by published asset names
+
+        A reference matches a source of manifest when it is the source's path
+        relative to base_dir, the template's folder.
+        """
+        if not manifest:
+            return self
+        published = {os.path.relpath(src, base_dir or ".").replace(os.sep, "/"): dest
+                     for src, dest in manifest.items()}
+        pattern = re.compile(r'((?:href|src)=")(?:\./)?('
+                             + "|".join(map(re.escape, published)) + r')"')
+        template = copy.copy(self)
+        template.literals = [pattern.sub(lambda m: f'{m.group(1)}{published[m.group(2)]}"', literal)
+                             for literal in self.literals]
+        return template
+
+    def render(self, values):
+        out = io.StringIO()
+        self.write(out, values)
+        return out.getvalue()
+
+    def unfilled(self, values):
+        """Slots present in the template that values does not fill"""
+        return sorted(set(self.slots) - set(values))
+
+    def unknown(self, values):
+        """Names in values that do not appear in the template"""
+        return sorted(set(values) - set(self.slots))
+
+
+def make_image_variant(src, dest, width, fmt, quality):
+    """Resize src to width and save it as fmt ('JPEG' or 'WEBP'); runs in a worker process"""
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.width > width:
+            im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+        if fmt == 'JPEG' and im.mode != 'RGB':
+            im = im.convert('RGB')
+        options = {'optimize': True, 'progressive': True} if fmt == 'JPEG' else {'method': 6}
+        atomic_write(dest, lambda tmp: im.save(tmp, fmt, quality=quality, **options))
+
+
+class ResponsiveImages:
+    """Resized JPEG/WebP variants for local <img> tags, cached by source hash"""
+    IMG_TAG = re.compile(r'<img\s[^>]*?\bsrc="(?![a-z]+:)([^"]+)"[^>]*>')
+    FORMATS = (('WEBP', 'webp', 'image/webp'), ('JPEG', 'jpeg', 'image/jpeg'))
+
+    def __init__(self, config):
+        self.config = config
+        self.cache_dir = os.path.join(config['CACHE_DIR'], "images")
+        self.stats = {'sources': 0, 'variants': 0, 'generated': 0}
+
+    def resolve(self, reference):
+        """Local file an <img src> points to, looked up next to the template or in IMG_DIR"""
+        candidates = [
+            os.path.join(os.path.dirname(self.config['TEMPLATE_FILE']), reference),
+            os.path.join(self.config['IMG_DIR'], os.path.basename(reference)),
+        ]
+        return next((path for path in candidates if os.path.isfile(path)), None)
+
+    def process(self, template):
+        """Generate variants for the template's local images and rewrite their tags.
+
+        Returns the rewritten template and the set of source files it handled.
+        """
+        references = {m.group(1) for literal in template.literals for m in self.IMG_TAG.finditer(literal)}
+        sources = {ref: self.resolve(ref) for ref in references}
+        sources = {ref: src for ref, src in sources.items() if src}
+        if not sources:
+            return template, set()
+        if Image is None:
+            print("⚠️ Pillow is not installed; images are published at full size")
+            return template, set()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        plans = {}
+        tasks = []
+        for ref, src in sources.items():
+            digest = file_digest(src)
+            with Image.open(src) as im:
+                size = ImageOps.exif_transpose(im).size
+            widths = sorted({min(w, size[0]) for w in self.config['IMAGE_WIDTHS']})
+            variants = []
+            for width in widths:
+                for fmt, ext, _ in self.FORMATS:
+                    cached = os.path.join(self.cache_dir, f"{digest[:16]}-{width}.{ext}")
+                    if not os.path.exists(cached):
+                        tasks.append((src, cached, width, fmt, self.config['IMAGE_QUALITY']))
+                    variants.append((width, ext, cached))
+            plans[ref] = (src, digest, size, variants)
+
+        if tasks:
+            pool_map(make_image_variant, *zip(*tasks), jobs=self.config.get('JOBS'))
+
+        tags = {ref: self.publish(*plan) for ref, plan in plans.items()}
+        self.stats = {'sources': len(plans), 'variants': sum(len(p[3]) for p in plans.values()),
+                      'generated': len(tasks)}
+
+        def rewrite(match):
+            return tags[match.group(1)](match.group(0)) if match.group(1) in tags else match.group(0)
+
+        template = copy.copy(template)
+        template.literals = [self.IMG_TAG.sub(rewrite, literal) for literal in template.literals]
+        return template, {plan[0] for plan in plans.values()}
+
+    def publish(self, src, digest, size, variants):
+        """Copy the variants of one image into OUTPUT_DIR/imgs and return its tag rewriter"""
+        stem = os.path.splitext(os.path.basename(src))[0]
+        dest_dir = os.path.join(self.config['OUTPUT_DIR'], "imgs")
+        os.makedirs(dest_dir, exist_ok=True)
+        srcsets = defaultdict(list)
+        for width, ext, cached in variants:
+            name = f"{stem}.{digest[:8]}-{width}.{ext}"
+            dest = os.path.join(dest_dir, name)
+            if not os.path.exists(dest):
+                atomic_copy(cached, dest)
+            srcsets[ext].append((width, f"imgs/{name}"))
+
+        largest_width, fallback = srcsets['jpeg'][-1]
+        height = round(size[1] * largest_width / size[0])
+        sizes = self.config['IMAGE_SIZES']
+
+        def srcset(ext):
+            return ", ".join(f"{path} {width}w" for width, path in srcsets[ext])
+
+        def rewrite(tag):
+            attrs = f'src="{fallback}" srcset="{srcset("jpeg")}" sizes="{sizes}"'
+            if 'width=' not in tag:
+                attrs += f' width="{largest_width}" height="{height}"'
+            img = re.sub(r'\bsrc="[^"]*"', lambda m: attrs, tag, count=1)
+            return f'<picture><source type="image/webp" srcset="{srcset("webp")}" sizes="{sizes}">{img}</picture>'
+        return rewrite
+
+
+class CssOptimizer:
+    """Prunes unused rules from the stylesheet and extracts the above-the-fold subset
+
+    Matching is conservative: a selector is kept unless it names a tag, class
+    or id that appears nowhere in the built HTML, the lazy fragments or the
+    string literals of the site's scripts (which add classes such as
+    'active' at run time). Pseudo-classes and attribute selectors are
+    ignored, so they never cause a rule to be dropped.
+    """
+    CSS_ITEM = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[{};]')
+    SELECTOR_IGNORED = re.compile(r'\[[^\]]*\]|::?[\w-]+(?:\([^)]*\))?')
+    SELECTOR_NAME = re.compile(r'([.#]?)(-?[_a-zA-Z][\w-]*)')
+    HTML_COMMENT = re.compile(r'<!--.*?-->', re.S)
+    HTML_TAG = re.compile(r'<([a-zA-Z][\w-]*)(' + HTML_ATTRS + r')>')
+    HTML_NAMES = re.compile(r'(?<![\w-])(class|id)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+    SCRIPT = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.S | re.I)
+    # Classes the scripts set as the page loads: the first section and its
+    # sidebar link are marked active. The critical CSS needs their rules
+    INITIAL_STATE = frozenset({'.active'})
+    JS_STRING = re.compile(r'"([^"\\\n]*)"|\'([^\'\\\n]*)\'|`([^`\\]*)`')
+
+    def __init__(self, config):
+        self.config = config
+        self.stats = {}
+
+    @classmethod
+    def parse(cls, css):
+        """Minified CSS as a list of (prelude, body); body is a list for @media/@supports blocks"""
+        items, _ = cls._parse_block(css, 0)
+        return items
+
+    @classmethod
+    def _parse_block(cls, css, pos):
+        items = []
+        start = pos
+        while True:
+            m = cls.CSS_ITEM.search(css, pos)
+            if m is None or m.group() == '}':
+                return items, (m.end() if m else len(css))
+            pos = m.end()
+            if m.group() == ';':
+                items.append((css[start:m.start()].strip(), None))
+                start = pos
+            elif m.group() == '{':
+                prelude = css[start:m.start()].strip()
+                if prelude.startswith(('@media', '@supports')):
+                    body, pos = cls._parse_block(css, pos)
+                else:
+                    # Declarations, or @font-face/@keyframes kept as raw text
+                    depth, body_start = 1, pos
+                    while depth:
+                        m = cls.CSS_ITEM.search(css, pos)
+                        if m is None:
+                            break
+                        pos = m.end()
+                        depth += {'{': 1, '}': -1}.get(m.group(), 0)
+                    body = css[body_start:pos - 1]
+                items.append((prelude, body))
+                start = pos
+
+    @staticmethod
+    def serialize(items):
+        parts = []
+        for prelude, body in items:
+            if body is None:
+                parts.append(prelude + ';')
+            elif isinstance(body, list):
+                parts.append(prelude + '{' + CssOptimizer.serialize(body) + '}')
+            else:
+                parts.append(prelude + '{' + body + '}')
+        return "".join(parts)
+
+    @staticmethod
+    def split_selectors(prelude):
+        """Split a selector list on top-level commas"""
+        selectors, depth, start = [], 0, 0
+        for i, ch in enumerate(prelude):
+            if ch in '([':
+                depth += 1
+            elif ch in ')]':
+                depth -= 1
+            elif ch == ',' and depth == 0:
+                selectors.append(prelude[start:i])
+                start = i + 1
+        selectors.append(prelude[start:])
+        return [sel.strip() for sel in selectors]
+
+    @classmethod
+    def selector_names(cls, selector):
+        """Tags, .classes and #ids a selector requires"""
+        selector = cls.SELECTOR_IGNORED.sub(' ', selector)
+        return {prefix + (name.lower() if not prefix else name)
+                for prefix, name in cls.SELECTOR_NAME.findall(selector)}
+
+    @classmethod
+    def html_names(cls, html):
+        """Tags, .classes and #ids used in html, plus every name its scripts mention
+
+        Commented-out markup does not count.
+        """
+        html = cls.HTML_COMMENT.sub('', html)
+        names = set()
+        for tag, attrs in cls.HTML_TAG.findall(html):
+            names.add(tag.lower())
+            for kind, dq, sq in cls.HTML_NAMES.findall(attrs):
+                values = (dq or sq).split()
+                names.update(('.' if kind == 'class' else '#') + value for value in values)
+        for script in cls.SCRIPT.findall(html):
+            names |= cls.script_names(script)
+        return names
+
+    @classmethod
+    def script_names(cls, script):
+        names = set()
+        for groups in cls.JS_STRING.findall(script):
+            for _, name in cls.SELECTOR_NAME.findall("".join(groups)):
+                names.update((name.lower(), '.' + name, '#' + name))
+        return names
+
+    def filter(self, items, names, stats):
+        """Keep only the rules and selectors whose names are all in names"""
+        kept = []
+        for prelude, body in items:
+            if isinstance(body, list):
+                inner = self.filter(body, names, stats)
+                if inner:
+                    kept.append((prelude, inner))
+            elif prelude.startswith('@') or body is None:
+                kept.append((prelude, body))
+            else:
+                stats['rules'] += 1
+                selectors = [sel for sel in self.split_selectors(prelude)
+                             if self.selector_names(sel) <= names]
+                stats['dropped'] += not selectors
+                if selectors:
+                    kept.append((",".join(selectors), body))
+        return kept
+
+    @staticmethod
+    def critical_items(items, names):
+        """Style rules (inside @media too) that apply to the above-the-fold markup"""
+        critical = []
+        for prelude, body in items:
+            if isinstance(body, list):
+                inner = CssOptimizer.critical_items(body, names)
+                if inner:
+                    critical.append((prelude, inner))
+            elif body is not None and not prelude.startswith('@'):
+                selectors = [sel for sel in CssOptimizer.split_selectors(prelude)
+                             if CssOptimizer.selector_names(sel) <= names]
+                if selectors:
+                    critical.append((",".join(selectors), body))
+        return critical
+
+    def optimize(self, css, names, critical_names):
+        """Return (pruned stylesheet, critical subset) of css
+
+        names keep rules in the pruned stylesheet: those of the page, the
+        lazy fragments and the external scripts. The critical subset is
+        chosen among the kept rules from critical_names (the markup above the
+        fold, see PageNames) and INITIAL_STATE.
+        """
+        stats = {'rules': 0, 'dropped': 0}
+        kept = self.filter(self.parse(minify_css(css).rstrip("\n")), names, stats)
+        critical = self.critical_items(kept, set(critical_names) | self.INITIAL_STATE)
+        self.stats = dict(stats, names=names)
+        return self.serialize(kept) + "\n", self.serialize(critical)
+
+    def selectors(self, css):
+        """Every selector of the style rules in css"""
+        found = []
+
+        def walk(items):
+            for prelude, body in items:
+                if isinstance(body, list):
+                    walk(body)
+                elif body is not None and not prelude.startswith('@'):
+                    found.extend(self.split_selectors(prelude))
+        walk(self.parse(css.rstrip("\n")))
+        return found
+
+
+class HtmlNameParser(HTMLParser):
+    """Tags, .classes and #ids of a document read with html.parser, plus the names
+    its scripts mention
+
+    Used to check the pruned stylesheet independently of the regular
+    expressions of CssOptimizer.html_names. Feed it the page in any pieces.
+    """
+    def __init__(self):
+        super().__init__()
+        self.names = set()
+        self.in_script = False
+
+    def handle_starttag(self, tag, attrs):
+        self.names.add(tag)
+        for name, value in attrs:
+            if name in ('class', 'id') and value:
+                self.names.update(('.' if name == 'class' else '#') + v for v in value.split())
+        self.in_script = tag == 'script'
+
+    def handle_endtag(self, tag):
+        if tag == 'script':
+            self.in_script = False
+
+    def handle_data(self, data):
+        if self.in_script:
+            self.names |= CssOptimizer.script_names(data)
+
+    @classmethod
+    def parse(cls, html):
+        parser = cls()
+        parser.feed(html)
+        parser.close()
+        return parser.names
+
+
+class PageNames:
+    """Names CssOptimizer needs from a page, collected chunk by chunk as it is written
+
+    Chunks must not cut a tag in two (see PageWriter). names gets every
+    name of the page; critical the names of the page down to the <section>
+    that follows the CRITICAL_UNTIL id, or down to the first <section> if
+    there is no such id.
+    """
+    SECTION = '<section'
+
+    def __init__(self, critical_until):
+        self.marker = f'id="{critical_until}"'
+        self.events = re.compile(re.escape(self.SECTION) + '|' + re.escape(self.marker))
+        self.names = set()
+        self.above = set()  # names so far, until the fold is known
+        self.head = None  # names before the first <section>
+        self.seen_marker = False
+        self.fold = None
+
+    def add(self, html):
+        html = CssOptimizer.HTML_COMMENT.sub('', html)
+        self.names |= CssOptimizer.html_names(html)
+        if self.fold is not None:
+            return
+        pos = 0
+        for m in self.events.finditer(html):
+            if m.group() == self.marker:
+                self.seen_marker = True
+                continue
+            self.above |= CssOptimizer.html_names(html[pos:m.start()])
+            pos = m.start()
+            if self.head is None:
+                self.head = set(self.above)
+            if self.seen_marker:
+                self.fold = self.above
+                return
+        self.above |= CssOptimizer.html_names(html[pos:])
+
+    @property
+    def critical(self):
+        if self.fold is not None:
+            return self.fold
+        if self.seen_marker or self.head is None:
+            return self.above
+        return self.head
+
+
+class Course:
+    """One lecture of courses.csv"""
+    __slots__ = ('lecture_type', 'name', 'duration')
+
+    def __init__(self, lecture_type, name, duration):
+        self.lecture_type = sys.intern(lecture_type)
+        self.name = name
+        self.duration = sys.intern(duration)
+
+
+class TeachingGenerator:
+    SECTION = Section('courses', ('COURSES_SECTION',), ('COURSES_CSV',), lazy='COURSES_SECTION')
+
+    def __init__(self, config):
+        self.config = config
+
+    def load_section(self, span, streaming=False):
+        return self.load_courses()
+
+    def render_section(self, courses_data, span, lazy=None, streaming=False):
+        if streaming:
+            return {'COURSES_SECTION': fragment_writer(self.iter_courses_html(courses_data, lazy))}
+        return {'COURSES_SECTION': self.generate_courses_html(courses_data, lazy)}
+    
+    def load_courses(self):
+        """Load courses data from CSV"""
+        courses_by_year = {}
+        
+        try:
+            with open(self.config['COURSES_CSV'], mode='r', encoding='utf-8') as csvfile:
+                reader = csv.DictReader(csvfile)
+                for row in reader:
                     year = row['Academic Year']
                     if year not in courses_by_year:
                         courses_by_year[year] = {
-                            'institution': row['Institution'],
+                            'institution': sys.intern(row['Institution']),
                             'courses': []
                         }
-                    courses_by_year[year]['courses'].append({
-                        'type': row['Lecture Type'],
-                        'name': row['Lecture Name'],
-                        'duration': row['Duration']
-                    })
+                    courses_by_year[year]['courses'].append(
+                        Course(row['Lecture Type'], row['Lecture Name'], row['Duration']))
         except FileNotFoundError:
             print(f"⚠️ Courses file not found: {self.config['COURSES_CSV']}")
         
         return courses_by_year
     
-    def generate_courses_html(self, courses_data):
+    def generate_courses_html(self, courses_data, lazy=None):
         """Generate HTML for courses with year tabs"""
+        return "\n".join(self.iter_courses_html(courses_data, lazy))
+
+    def iter_courses_html(self, courses_data, lazy=None):
+        """Yield the courses HTML fragment by fragment; lazy works as for publications"""
         if not courses_data:
-            return '<p>No course data available.</p>'
+            yield '<p>No course data available.</p>'
+            return
         
         years = sorted(courses_data.keys(), reverse=True)
         
-        html = ['<div class="courses-container">']
-        html.append('<div class="course-tabs">')
+        yield '<div class="courses-container">'
+        yield '<div class="course-tabs">'
         
         for i, year in enumerate(years):
             active_class = " active" if i == 0 else ""
-            html.append(f'<button class="course-tab{active_class}" data-year="{year}">{year}</button>')
-        html.append('</div>')
+            yield f'<button class="course-tab{active_class}" data-year="{year}" data-tab="courses-{year}">{year}</button>'
+        yield '</div>'
         
         for i, year in enumerate(years):
-            display_style = "block" if i == 0 else "none"
-            institution = courses_data[year]['institution']
-            
-            html.append(f'<div id="courses-{year}" class="course-content" style="display:{display_style}">')
-            html.append(f'<p class="institution"><i>Lectures taught at {institution}</i></p>')
-            html.append('<table class="course-table">')
-            
-            for course in courses_data[year]['courses']:
-                html.append(f"""
+            if lazy and i > 0:
+                src = lazy(f"courses-{year}", "\n".join(self.iter_year_courses_html(courses_data[year])))
+                yield year_open_html(f"courses-{year}", "course-content", False, src=src)
+            else:
+                yield year_open_html(f"courses-{year}", "course-content", i == 0)
+                yield from self.iter_year_courses_html(courses_data[year])
+            yield '</div>'
+        
+        yield '</div>'
+
+
+    def iter_year_courses_html(self, year_data):
+        """Yield the content of one academic year's tab"""
+        institution = year_data['institution']
+        yield f'<p class="institution"><i>Lectures taught at {institution}</i></p>'
+        yield '<table class="course-table">'
+        
+        for course in year_data['courses']:
+            yield f"""
                 <tr>
-                    <td class="course-type">{course['type']}</td>
-                    <td class="course-name">{course['name']}</td>
-                    <td class="course-duration">{course['duration']}</td>
+                    <td class="course-type">{course.lecture_type}</td>
+                    <td class="course-name">{course.name}</td>
+                    <td class="course-duration">{course.duration}</td>
                 </tr>
-                """)
-            
-            html.append('</table>')
-            html.append('</div>')
+                """
         
-        html.append('</div>')
-        return "\n".join(html)
+        yield '</table>'
+
+
+class NewsItem:
+    """One row of news.csv"""
+    __slots__ = ('date', 'event', 'link')
+
+    def __init__(self, date, event, link):
+        self.date = date
+        self.event = event
+        self.link = link
+
+
+class NewsIndex:
+    """Sidecar index of news.csv: one (date ordinal, byte offset) record per row, in date order
+
+    Kept in CACHE_DIR/news.index and rebuilt only when the size or
+    modification time of news.csv changes. The records have a fixed size,
+    so the first upcoming item is found by a binary search on the index
+    file, and only the selected rows are read back from the CSV: a build
+    parses no dates beyond those and does O(log n) reads, whatever the size
+    of the archive.
+    """
+    VERSION = 2
+    HEADER = struct.Struct('<IQqI')  # version, CSV size, CSV mtime_ns, row count
+    RECORD = struct.Struct('<IQ')  # date ordinal, offset of the row in the CSV
+
+    def __init__(self, config):
+        self.csv_path = config['NEWS_CSV']
+        self.path = os.path.join(config['CACHE_DIR'], "news.index")
+        self.count = 0
+
+    def load(self):
+        """Bring the index up to date with news.csv; False if the file does not exist"""
+        try:
+            st = os.stat(self.csv_path)
+        except FileNotFoundError:
+            return False
+        stamp = (self.VERSION, st.st_size, st.st_mtime_ns)
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(self.HEADER.size)
+            if len(header) == self.HEADER.size and self.HEADER.unpack(header)[:3] == stamp:
+                self.count = self.HEADER.unpack(header)[3]
+                return True
+        except OSError:
+            pass
+        self.rebuild(stamp)
+        return True
+
+    def rebuild(self, stamp):
+        records = []
+        with open(self.csv_path, "rb") as f:
+            date_col = self.read_fields(f).index('date')
+            while True:
+                offset = f.tell()
+                row = self.read_row(f)
+                if row is None:
+                    break
+                if row:  # csv.DictReader skips blank lines too
+                    records.append((datetime.strptime(row[date_col], '%Y-%m-%d').toordinal(), offset))
+        # Rows of the same day keep their order in the file
+        records.sort()
+        write_if_changed(self.path, self.HEADER.pack(*stamp, len(records))
+                         + b"".join(self.RECORD.pack(*record) for record in records))
+        self.count = len(records)
+
+    @staticmethod
+    def read_row(f):
+        """Fields of the next CSV row of the binary file f (a row may span quoted line breaks), or None at the end"""
+        data = f.readline()
+        if not data:
+            return None
+        while data.count(b'"') % 2:
+            line = f.readline()
+            if not line:
+                break
+            data += line
+        return next(csv.reader(data.decode("utf-8").splitlines(True)), [])
+
+    def read_fields(self, f):
+        f.seek(0)
+        return self.read_row(f) or []
+
+    def record(self, index, i):
+        index.seek(self.HEADER.size + i * self.RECORD.size)
+        return self.RECORD.unpack(index.read(self.RECORD.size))
+
+    def first_from(self, index, today):
+        """Position of the first record dated today or later (binary search)"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.record(index, mid)[0] < today.toordinal():
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def upcoming(self, today, count):
+        """The first count items dated today or later"""
+        with open(self.path, "rb") as index, open(self.csv_path, "rb") as f:
+            fields = self.read_fields(f)
+            start = self.first_from(index, today)
+            items = []
+            for i in range(start, min(start + count, self.count)):
+                f.seek(self.record(index, i)[1])
+                row = dict(zip(fields, self.read_row(f)))
+                items.append(NewsItem(datetime.strptime(row['date'], '%Y-%m-%d'), row['event'].strip(),
+                                      (row.get('link') or '').strip()))
+        return items
+
+    def next_change(self, today):
+        """The day after the earliest upcoming item, when it drops out of the selection"""
+        with open(self.path, "rb") as index:
+            start = self.first_from(index, today)
+            if start == self.count:
+                return None
+            return datetime.fromordinal(self.record(index, start)[0] + 1).date()
 
 
 class NewsGenerator:
+    SECTION = Section('news', ('NEWS_SECTION',), ('NEWS_CSV',), dated=True, config=('NEWS_ITEMS',))
+
     def __init__(self, config):
         self.config = config
+        self.index = NewsIndex(config)
+        self.today = None
+
+    def load_section(self, span, streaming=False):
+        return self.load_news()
+
+    def render_section(self, news_items, span, lazy=None, streaming=False):
+        return {'NEWS_SECTION': self.generate_news_html(news_items)}
     
     def load_news(self):
-        """Load CSV with events and links separated"""
-        try:
-            with open(self.config['NEWS_CSV'], mode='r', encoding='utf-8') as csvfile:
-                news_items = [
-                    {
-                        'date': datetime.strptime(row['date'], '%Y-%m-%d'),
-                        'event': row['event'].strip(),
-                        'link': row.get('link', '').strip()
-                    } for row in csv.DictReader(csvfile)
-                ]
-                
-                # Filter out news items with dates in the past
-                future_news_items = [item for item in news_items if item['date'].date() >= datetime.now().date()]
-                
-                # Sort the remaining news items by date
-                future_news_items.sort(key=lambda x: x['date'], reverse=False)
-                
-                # Return only the first 3 future news items
-                return future_news_items[:3]
-        except FileNotFoundError:
+        """Upcoming news items, from today (self.today, default: the current date) on"""
+        if not self.index.load():
             print(f"⚠️ News file not found: {self.config['NEWS_CSV']}")
             return []
+        return self.index.upcoming(self.today or datetime.now().date(), self.config.get('NEWS_ITEMS', 3))
+
+    def next_change(self, today):
+        if not self.index.load():
+            return None
+        return self.index.next_change(today)
 
     def generate_news_html(self, news_items):
         """Generate news list with links only in event names"""
         if not news_items:
             return ""
         
+        today = self.today or datetime.now().date()
         items = []
         for item in news_items:
-            event = sanitize_html(item['event'])
-            if item['link']:
-                event = f'<a href="{item["link"]}" target="_blank" rel="noopener">{event}</a>'
+            event = sanitize_html(item.event)
+            if item.link:
+                event = f'<a href="{item.link}" target="_blank" rel="noopener">{event}</a>'
             
-            date_str = item['date'].strftime("%Y-%m-%d")
-            if item['date'].date() < datetime.now().date():
+            date_str = item.date.strftime("%Y-%m-%d")
+            if item.date.date() < today:
                 date_str = f'<del>{date_str}</del>'
             
             items.append(f'<li><b>{date_str}</b>: {event}</li>')
@@ -564,9 +2245,32 @@ class NewsGenerator:
 '''
 
 
+class Presentation:
+    """One talk of presentations.csv; event, place, month and authors repeat and are interned"""
+    __slots__ = ('title', 'event', 'location', 'month', 'authors')
+
+    def __init__(self, title, event, location, month, authors):
+        self.title = title
+        self.event = sys.intern(event)
+        self.location = sys.intern(location)
+        self.month = sys.intern(month)
+        self.authors = sys.intern(authors or '')
+
+
 class PresentationGenerator:
+    SECTION = Section('presentations', ('PRESENTATIONS_SECTION',), ('PRESENTATIONS_CSV',),
+                      lazy='PRESENTATIONS_SECTION')
+
     def __init__(self, config):
         self.config = config
+
+    def load_section(self, span, streaming=False):
+        return self.load_presentations()
+
+    def render_section(self, presentations, span, lazy=None, streaming=False):
+        if streaming:
+            return {'PRESENTATIONS_SECTION': fragment_writer(self.iter_presentations_html(presentations, lazy))}
+        return {'PRESENTATIONS_SECTION': self.generate_presentations_html(presentations, lazy)}
     
     def load_presentations(self):
         """Load presentations data from CSV"""
@@ -577,122 +2281,179 @@ class PresentationGenerator:
                 reader = csv.DictReader(csvfile)
                 for row in reader:
                     year = row['Year']
-                    presentations_by_year[year].append({
-                        'title': row['Title'],
-                        'event': row['Event'],
-                        'location': row['Place'],
-                        'month': row['Month'],
-                        'authors': row.get('Authors', '')
-                    })
+                    presentations_by_year[year].append(
+                        Presentation(row['Title'], row['Event'], row['Place'], row['Month'],
+                                     row.get('Authors', '')))
         except FileNotFoundError:
             print(f"⚠️ Presentations file not found: {self.config['PRESENTATIONS_CSV']}")
         
         return dict(presentations_by_year)
     
-    def generate_presentations_html(self, presentations_data):
+    def generate_presentations_html(self, presentations_data, lazy=None):
         """Generate HTML for presentations with year tabs"""
+        return "\n".join(self.iter_presentations_html(presentations_data, lazy))
+
+    def iter_presentations_html(self, presentations_data, lazy=None):
+        """Yield the presentations HTML fragment by fragment; lazy works as for publications"""
         if not presentations_data:
-            return '<p>No presentations available.</p>'
+            yield '<p>No presentations available.</p>'
+            return
         
         years = sorted(presentations_data.keys(), reverse=True)
         
-        html = ['<div class="presentations-container">']
-        html.append('<div class="presentation-tabs">')
+        yield '<div class="presentations-container">'
+        yield '<div class="presentation-tabs">'
         
         for i, year in enumerate(years):
             active_class = " active" if i == 0 else ""
-            html.append(f'<button class="presentation-tab{active_class}" data-year="{year}">{year}</button>')
-        html.append('</div>')
+            yield (f'<button class="presentation-tab{active_class}" data-year="{year}" '
+                   f'data-tab="presentations-{year}">{year}</button>')
+        yield '</div>'
         
         for i, year in enumerate(years):
-            display_style = "block" if i == 0 else "none"
+            if lazy and i > 0:
+                src = lazy(f"presentations-{year}",
+                           "\n".join(self.iter_year_presentations_html(year, presentations_data[year])))
+                yield year_open_html(f"presentations-{year}", "presentation-content", False, src=src)
+            else:
+                yield year_open_html(f"presentations-{year}", "presentation-content", i == 0)
+                yield from self.iter_year_presentations_html(year, presentations_data[year])
             
-            html.append(f'<div id="presentations-{year}" class="presentation-content" style="display:{display_style}">')
+            yield '</div>'
+        
+        yield '</div>'
+
+
+    def iter_year_presentations_html(self, year, presentations):
+        """Yield the content of one year's tab"""
+        for presentation in presentations:
+            title = sanitize_html(presentation.title)
+            if presentation.authors:
+                title = f"<em>{title}</em>"
             
-            for presentation in presentations_data[year]:
-                title = sanitize_html(presentation['title'])
-                if presentation.get('authors'):
-                    title = f"<em>{title}</em>"
-                
-                html.append(f"""
+            yield f"""
                 <div class="presentation-item">
                     <div class="presentation-title">{title}</div>
                     <div class="presentation-meta">
-                        <span>{presentation['event']}</span> | 
-                        <span>{presentation['location']}</span> | 
-                        <span>{presentation['month']} {year}</span>
+                        <span>{presentation.event}</span> | 
+                        <span>{presentation.location}</span> | 
+                        <span>{presentation.month} {year}</span>
                     </div>
                 </div>
-                """)
-            
-            html.append('</div>')
-        
-        html.append('</div>')
-        return "\n".join(html)
+                """
 
 
-class SiteBuilder:
+class ScrollScriptGenerator:
+    """Sidebar navigation script: click to activate a section, highlight the one in view"""
+    SECTION = Section('scroll script', ('MAIN_SCRIPT',), config=('SCROLL_TRACKING',))
+
+    # Implementations of the section tracking part of the scroll script
+    SCROLL_TRACKING = {
+        'scroll': """
+            // Actualización automática basada en scroll
+            function updateActiveLinkOnScroll() {
+                let current = '';
+                
+                sections.forEach(section => {
+                    const sectionTop = section.offsetTop;
+                    const sectionHeight = section.clientHeight;
+                    if (scrollY >= (sectionTop - 200)) { // Margen mayor para mejor UX
+                        current = section.getAttribute('id');
+                    }
+                });
+                
+                if (current) {
+                    // Solo actualizar clases, no hacer scroll
+                    sections.forEach(section => {
+                        section.classList.remove('active');
+                        if (section.id === current) {
+                            section.classList.add('active');
+                        }
+                    });
+                    
+                    navLinks.forEach(link => {
+                        link.classList.remove('active');
+                        if (link.getAttribute('href') === '#' + current) {
+                            link.classList.add('active');
+                        }
+                    });
+                }
+            }
+            
+            // Escuchar eventos de scroll
+            let scrollTimeout;
+            window.addEventListener('scroll', function() {
+                clearTimeout(scrollTimeout);
+                scrollTimeout = setTimeout(updateActiveLinkOnScroll, 100);
+            });
+            
+""",
+        'observer': """
+            // Seguimiento de la sección visible con IntersectionObserver:
+            // una línea a 200px del borde superior (mismo margen que el modo scroll)
+            function markActive(sectionId) {
+                if (sectionId === current) return;
+                [current, sectionId].forEach(id => {
+                    const section = id && document.getElementById(id);
+                    const link = id && document.querySelector(`.sidebar-nav a[href="#${id}"]`);
+                    const active = id === sectionId;
+                    if (section) section.classList.toggle('active', active);
+                    if (link) link.classList.toggle('active', active);
+                });
+                current = sectionId;
+            }
+            
+            let observer;
+            function observeSections() {
+                if (observer) observer.disconnect();
+                const bottom = Math.min(0, 201 - window.innerHeight);
+                observer = new IntersectionObserver(entries => {
+                    entries.forEach(entry => {
+                        if (entry.isIntersecting) markActive(entry.target.id);
+                    });
+                }, {rootMargin: `-200px 0px ${bottom}px 0px`});
+                sections.forEach(section => observer.observe(section));
+            }
+            
+            if ('IntersectionObserver' in window) {
+                observeSections();
+                let resizeTimeout;
+                window.addEventListener('resize', function() {
+                    clearTimeout(resizeTimeout);
+                    resizeTimeout = setTimeout(observeSections, 200);
+                });
+            }
+            
+""",
+    }
+
     def __init__(self, config):
         self.config = config
-        self.pub_gen = PublicationGenerator(config)
-        self.teach_gen = TeachingGenerator(config)
-        self.news_gen = NewsGenerator(config)
-        self.pres_gen = PresentationGenerator(config)
-    
-    def build_site(self):
-        """Main build function"""
-        start_time = datetime.now()
-        
-        # Create output directory
-        os.makedirs(self.config['OUTPUT_DIR'], exist_ok=True)
-        
-        # Load data
-        bib_db = self.pub_gen.load_bibtex()
-        stats = self.pub_gen.generate_stats(bib_db)
-        courses_data = self.teach_gen.load_courses()
-        news_items = self.news_gen.load_news()
-        presentations = self.pres_gen.load_presentations()
-        
-        # Read template
-        with open(self.config['TEMPLATE_FILE'], "r", encoding="utf-8") as f:
-            template = f.read()
-
-        # Generate and insert content
-        template = template.replace("<!-- STATS_PANEL -->", self.pub_gen.generate_stats_html(stats))
-        template = template.replace("<!-- PUBLICATIONS -->", 
-                                  self.pub_gen.generate_publications_html(bib_db, color_coded=True))
-        template = template.replace("<!-- PUB_SCRIPTS -->", self.pub_gen.add_tab_script())
-        template = template.replace("<!-- COURSES_SECTION -->", self.teach_gen.generate_courses_html(courses_data))
-        template = template.replace("<!-- NEWS_SECTION -->", self.news_gen.generate_news_html(news_items))
-        template = template.replace("<!-- PRESENTATIONS_SECTION -->", self.pres_gen.generate_presentations_html(presentations))
 
+    def load_section(self, span, streaming=False):
+        return None
+
+    def render_section(self, data, span, lazy=None, streaming=False):
         # Add scroll highlighting script CON OPCIÓN DE CLICK PARA ACTIVAR
-        template = template.replace("<!-- MAIN_SCRIPT -->", self._generate_enhanced_scroll_script())
+        return {'MAIN_SCRIPT': self.generate_script()}
 
-        # Generate update
-        current_date = datetime.now().strftime("%B %d, %Y")
-        template = template.replace("<!-- LAST_UPDATED -->", current_date)
+    def generate_script(self, tracking=None):
+        """Generate JavaScript for scroll highlighting with click activation
 
-        # Write output file
-        output_path = os.path.join(self.config['OUTPUT_DIR'], "index.html")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(template)
-        
-        # Copy static assets
-        self.copy_assets()
-        
-        # Calculate build time
-        build_time = (datetime.now() - start_time).total_seconds()
-        print(f"✅ Site built successfully in {build_time:.2f} seconds")
-        print(f"📁 Output directory: {os.path.abspath(self.config['OUTPUT_DIR'])}")
-    
-    def _generate_enhanced_scroll_script(self):
-        """Generate JavaScript for scroll highlighting with click activation"""
+        tracking selects how the section in view is followed: 'observer'
+        (IntersectionObserver, DOM is only touched when the section changes)
+        or 'scroll' (debounced scroll handler that measures every section).
+        Defaults to CONFIG['SCROLL_TRACKING'].
+        """
+        tracking = tracking or self.config.get('SCROLL_TRACKING', 'observer')
+        if tracking not in self.SCROLL_TRACKING:
+            raise ValueError(f"Unknown scroll tracking {tracking!r}, expected one of {sorted(self.SCROLL_TRACKING)}")
         return """
         <script>
         document.addEventListener('DOMContentLoaded', function() {
             const sections = document.querySelectorAll('.main-content section');
             const navLinks = document.querySelectorAll('.sidebar-nav a');
+            let current = ''; // Sección activa
             
             // Función para activar una sección específica
             function activateSection(sectionId, scrollTo = true) {
@@ -728,6 +2489,7 @@ class SiteBuilder:
                 
                 // Actualizar URL
                 history.replaceState(null, null, `#${sectionId}`);
+                current = sectionId;
             }
             
             // Hacer clic en una sección la activa
@@ -746,44 +2508,7 @@ class SiteBuilder:
                     activateSection(sectionId, true); // Con scroll
                 });
             });
-            
-            // Actualización automática basada en scroll
-            function updateActiveLinkOnScroll() {
-                let current = '';
-                
-                sections.forEach(section => {
-                    const sectionTop = section.offsetTop;
-                    const sectionHeight = section.clientHeight;
-                    if (scrollY >= (sectionTop - 200)) { // Margen mayor para mejor UX
-                        current = section.getAttribute('id');
-                    }
-                });
-                
-                if (current) {
-                    // Solo actualizar clases, no hacer scroll
-                    sections.forEach(section => {
-                        section.classList.remove('active');
-                        if (section.id === current) {
-                            section.classList.add('active');
-                        }
-                    });
-                    
-                    navLinks.forEach(link => {
-                        link.classList.remove('active');
-                        if (link.getAttribute('href') === '#' + current) {
-                            link.classList.add('active');
-                        }
-                    });
-                }
-            }
-            
-            // Escuchar eventos de scroll
-            let scrollTimeout;
-            window.addEventListener('scroll', function() {
-                clearTimeout(scrollTimeout);
-                scrollTimeout = setTimeout(updateActiveLinkOnScroll, 100);
-            });
-            
+            """ + self.SCROLL_TRACKING[tracking] + """
             // Activar sección inicial basada en URL hash o primera sección
             const initialHash = window.location.hash.substring(1);
             if (initialHash && document.getElementById(initialHash)) {
@@ -794,95 +2519,1230 @@ class SiteBuilder:
                 // Activar primera sección por defecto
                 if (sections.length > 0) {
                     sections[0].classList.add('active');
+                    current = sections[0].id;
                     const firstLink = document.querySelector(`.sidebar-nav a[href="#${sections[0].id}"]`);
                     if (firstLink) {
                         firstLink.classList.add('active');
                     }
                 }
             }
-            
-            // Inicializar también las pestañas internas
-            setTimeout(() => {
-                // Pestañas de publicaciones
-                const pubTabs = document.querySelectorAll('.publication-tab');
-                pubTabs.forEach(tab => {
-                    tab.addEventListener('click', function() {
-                        const year = this.getAttribute('data-year');
-                        
-                        // Hide all publication contents
-                        document.querySelectorAll('.publication-content').forEach(content => {
-                            content.style.display = 'none';
-                        });
-                        
-                        // Remove active class from all publication tabs
-                        pubTabs.forEach(t => t.classList.remove('active'));
-                        
-                        // Show selected content and mark tab as active
-                        document.getElementById('pub-' + year).style.display = 'block';
-                        this.classList.add('active');
-                    });
-                });
-                
-                // Pestañas de cursos
-                const courseTabs = document.querySelectorAll('.course-tab');
-                courseTabs.forEach(tab => {
-                    tab.addEventListener('click', function() {
-                        const year = this.getAttribute('data-year');
-                        
-                        // Hide all course contents
-                        document.querySelectorAll('.course-content').forEach(content => {
-                            content.style.display = 'none';
-                        });
-                        
-                        // Remove active class from all course tabs
-                        courseTabs.forEach(t => t.classList.remove('active'));
-                        
-                        // Show selected content and mark tab as active
-                        document.getElementById('courses-' + year).style.display = 'block';
-                        this.classList.add('active');
-                    });
-                });
-                
-                // Pestañas de presentaciones
-                const presTabs = document.querySelectorAll('.presentation-tab');
-                presTabs.forEach(tab => {
-                    tab.addEventListener('click', function() {
-                        const year = this.getAttribute('data-year');
-                        
-                        // Hide all presentation contents
-                        document.querySelectorAll('.presentation-content').forEach(content => {
-                            content.style.display = 'none';
-                        });
-                        
-                        // Remove active class from all presentation tabs
-                        presTabs.forEach(t => t.classList.remove('active'));
-                        
-                        // Show selected content and mark tab as active
-                        document.getElementById('presentations-' + year).style.display = 'block';
-                        this.classList.add('active');
-                    });
-                });
-            }, 200);
         });
         </script>
         """
+
+
+class BuildProfiler:
+    """Named, nestable timing spans for the build stages
+
+    Each span records wall time, CPU time and, through tracemalloc (unless
+    trace_memory is False), the net memory allocated and the peak reached
+    while it was open. With
+    use_cprofile=True every top-level span also runs under cProfile and the
+    stats of the slowest one are kept. Disabled profilers cost one attribute
+    check per span.
+
+    Spans may be opened from several threads; each thread keeps its own
+    stack, and nested() lets a worker thread open its spans inside a span
+    of the thread that started it. tracemalloc counts every thread, so the
+    memory figures of spans that overlap in time include each other's.
+    """
+
+    def __init__(self, enabled=False, use_cprofile=False, trace_memory=True):
+        self.enabled = enabled
+        self.use_cprofile = use_cprofile
+        self.trace_memory = trace_memory
+        self.spans = []
+        self.local = threading.local()
+        self.slowest = None  # (wall, name, cProfile.Profile)
+
+    @property
+    def stack(self):
+        """Open spans of the calling thread, innermost last"""
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    @contextlib.contextmanager
+    def nested(self, stack):
+        """Open this thread's spans inside the spans of stack (another thread's, see stack)"""
+        saved = self.stack
+        self.local.stack = list(stack)
+        try:
+            yield
+        finally:
+            self.local.stack = saved
+
+    def start(self):
+        if self.enabled:
+            self.origin = time.perf_counter()
+            if self.trace_memory:
+                tracemalloc.start()
+
+    def stop(self):
+        if self.enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def span(self, name):
+        if not self.enabled:
+            yield
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if self.stack:
+            # The parent's peak so far, before the counter is reset for this span
+            self.stack[-1]['peak_abs'] = max(self.stack[-1]['peak_abs'], peak)
+        tracemalloc.reset_peak()
+        record = {'name': name, 'depth': len(self.stack),
+                  'path': "/".join([s['name'] for s in self.stack] + [name]),
+                  'thread': threading.current_thread().name,
+                  'mem_start': current, 'peak_abs': current}
+        self.stack.append(record)
+        profile = cProfile.Profile() if self.use_cprofile and record['depth'] == 0 else None
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profile:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            record['wall_ms'] = (time.perf_counter() - wall) * 1000
+            record['cpu_ms'] = (time.process_time() - cpu) * 1000
+            record['start_ms'] = (wall - self.origin) * 1000
+            current, peak = tracemalloc.get_traced_memory()
+            peak_abs = max(record.pop('peak_abs'), peak)
+            record['alloc_kb'] = (current - record['mem_start']) / 1024
+            record['peak_kb'] = (peak_abs - record.pop('mem_start')) / 1024
+            self.stack.pop()
+            if self.stack:
+                self.stack[-1]['peak_abs'] = max(self.stack[-1]['peak_abs'], peak_abs)
+            tracemalloc.reset_peak()
+            self.spans.append(record)
+            if profile and (self.slowest is None or record['wall_ms'] > self.slowest[0]):
+                self.slowest = (record['wall_ms'], name, profile)
+
+    def report(self):
+        """Spans in start order"""
+        return sorted(self.spans, key=lambda r: r['start_ms'])
+
+    def write(self, path):
+        """Write the spans as a Chrome trace (chrome://tracing, Perfetto) with the raw list under 'spans'"""
+        spans = self.report()
+        threads = {name: tid for tid, name in enumerate(dict.fromkeys(r['thread'] for r in spans), 1)}
+        events = [{'name': r['name'], 'ph': 'X', 'pid': 1, 'tid': threads[r['thread']],
+                   'ts': round(r['start_ms'] * 1000), 'dur': round(r['wall_ms'] * 1000),
+                   'args': {'cpu_ms': round(r['cpu_ms'], 3), 'alloc_kb': round(r['alloc_kb'], 1),
+                            'peak_kb': round(r['peak_kb'], 1)}}
+                  for r in spans]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms', 'spans': spans}, f, indent=1)
+            f.write("\n")
+        if self.slowest:
+            wall, name, profile = self.slowest
+            stats_path = os.path.splitext(path)[0] + ".prof"
+            profile.dump_stats(stats_path)
+            return stats_path, name
+        return None, None
+
+    def print_table(self):
+        print(f"⏱️ {'stage':<40} {'wall ms':>9} {'cpu ms':>9} {'alloc KB':>9} {'peak KB':>9}")
+        for r in self.report():
+            label = "  " * r['depth'] + r['name']
+            print(f"   {label:<40} {r['wall_ms']:>9.1f} {r['cpu_ms']:>9.1f} "
+                  f"{r['alloc_kb']:>9.1f} {r['peak_kb']:>9.1f}")
+
+
+class SiteBuilder:
+    # Generators filling the template, in the order their sections are merged
+    # (see Section). Adding a section means adding its generator here.
+    GENERATORS = (PublicationGenerator, TeachingGenerator, NewsGenerator, PresentationGenerator,
+                  ScrollScriptGenerator)
+    # Stands for the stylesheet <link> until the pruned CSS is known; a tag,
+    # so minification leaves it alone
+    CSS_PLACEHOLDER = '<link data-optimized-css>'
+
+    def __init__(self, config, bibliographies=None):
+        self.config = config
+        self.generators = {cls.SECTION.name: cls(config) for cls in self.GENERATORS}
+        self.pub_gen = self.generators['publications']
+        self.pub_gen.bibliographies = bibliographies or {}
+        self.teach_gen = self.generators['courses']
+        self.news_gen = self.generators['news']
+        self.pres_gen = self.generators['presentations']
+        self.fragments = FragmentCache(config)
+        self.images = ResponsiveImages(config)
+        self.css = CssOptimizer(config)
+        self.profiler = BuildProfiler()
+        self.section_times = {}
+
+    @classmethod
+    def lazy_sections(cls):
+        """Section names accepted in LAZY_YEARS"""
+        return [gen.SECTION.name for gen in cls.GENERATORS if gen.SECTION.lazy]
+
+    @classmethod
+    def section_inputs(cls):
+        """CONFIG keys of the data files the sections are rendered from"""
+        return list(dict.fromkeys(key for gen in cls.GENERATORS for key in gen.SECTION.inputs))
+
+    @classmethod
+    def input_keys(cls):
+        """CONFIG keys of every file the page is built from"""
+        return cls.section_inputs() + ['TEMPLATE_FILE', 'CSS_FILE', 'JS_FILE']
+
+    def section_keys(self, today):
+        """Hash of everything each section is rendered from"""
+        digests = {}
+        base = hashlib.sha256()
+        base.update((file_digest(os.path.abspath(__file__)) or "").encode())
+        lazy_sections = set(self.config.get('LAZY_YEARS') or ())
+        keys = {}
+        for gen in self.generators.values():
+            section = gen.SECTION
+            config_keys = section.config
+            if section.lazy and section.name in lazy_sections:
+                # Fragment file names depend on minification and live in OUTPUT_DIR
+                config_keys += ('MINIFY', 'OUTPUT_DIR')
+            for name in section.slots:
+                h = base.copy()
+                h.update(name.encode())
+                if name == section.lazy and section.name in lazy_sections:
+                    h.update(b"lazy years")
+                for config_key in section.inputs:
+                    if config_key not in digests:
+                        digests[config_key] = file_digest(self.config[config_key])
+                    h.update(f"{config_key}={digests[config_key]}".encode())
+                for config_key in config_keys:
+                    h.update(f"{config_key}={self.config.get(config_key)!r}".encode("utf-8"))
+                if section.dated:
+                    h.update(today.strftime("%Y-%m-%d").encode())
+                keys[name] = h.hexdigest()
+        return keys
     
-    def copy_assets(self):
-        """Copy all required static assets"""
-        # Copy CSS
-        if os.path.exists(self.config['CSS_FILE']):
-            shutil.copy2(self.config['CSS_FILE'], self.config['OUTPUT_DIR'])
-        else:
-            print(f"⚠️ CSS file not found: {self.config['CSS_FILE']}")
+    def build_site(self, streaming=False, force=False, profile=None, cprofile=False, timings=False,
+                   precompress=True):
+        """Main build function
+
+        Sections whose inputs have not changed since the previous build are
+        taken from the fragment cache; force=True renders everything again.
+
+        With streaming=True, BibTeX entries are parsed, counted and rendered in
+        a single pass and spooled to disk, and every section is written to
+        index.html fragment by fragment, so memory does not grow with the
+        number of publications, courses or talks. The fragment cache is not
+        used in this mode.
+
+        profile is a path for a per-stage timing report (see BuildProfiler);
+        with cprofile=True the cProfile stats of the slowest stage are saved
+        next to it. timings=True records the stage times in self.profiler
+        without tracing memory or writing a report. precompress=False leaves
+        the .gz/.br copies as they are (see optimize_output).
+        """
+        start_time = datetime.now()
+        self.profiler = BuildProfiler(enabled=bool(profile) or timings, use_cprofile=cprofile,
+                                      trace_memory=bool(profile))
+        self.profiler.start()
+        
+        # Create output directory
+        os.makedirs(self.config['OUTPUT_DIR'], exist_ok=True)
+        before = snapshot_dir(self.config['OUTPUT_DIR'])
+        span = self.profiler.span
         
-        # Copy profile image if exists
-        profile_img_src = os.path.join(self.config['IMG_DIR'], "photo_opt3.jpeg")
-        if os.path.exists(profile_img_src):
-            os.makedirs(os.path.join(self.config['OUTPUT_DIR'], "imgs"), exist_ok=True)
-            shutil.copy2(profile_img_src, os.path.join(self.config['OUTPUT_DIR'], "imgs"))
+        # Read template
+        with span("load template"):
+            template = CompiledTemplate.load(self.config['TEMPLATE_FILE'], self.config['CACHE_DIR'])
+
+        # Reuse sections whose inputs are unchanged; slots the template does
+        # not have are neither rendered nor cached
+        with span("fragment cache lookup"):
+            keys = self.section_keys(start_time)
+            skipped = [name for name in keys if name not in template.slots]
+            keys = {name: key for name, key in keys.items() if name in template.slots}
+            sections, outputs = ({}, {}) if force or streaming else self.fragments.lookup(keys)
+            reused = [name for name in keys if name in sections]
+
+        # Fragment files for the years that are fetched on demand
+        lazy_sections = set(self.config.get('LAZY_YEARS') or ())
+        lazy = {gen.SECTION.lazy: YearFragments(self.config) for gen in self.generators.values()
+                if gen.SECTION.lazy and gen.SECTION.name in lazy_sections}
+
+        # Load the data of every section not reused, then render them; each
+        # step runs on a thread pool and is merged in registry order
+        for gen in self.generators.values():
+            if gen.SECTION.dated:
+                gen.today = start_time.date()
+        jobs = 1 if cprofile else self.config.get('JOBS')
+        pending = [gen for gen in self.generators.values()
+                   if any(slot in keys and slot not in sections for slot in gen.SECTION.slots)]
+        self.section_times = {gen.SECTION.name: {} for gen in pending}
+        with span("load sections"):
+            loaded = self.map_sections("load", lambda gen: gen.load_section(span, streaming), pending, jobs)
+        data = {gen.SECTION.name: result for gen, result in zip(pending, loaded)}
+        with span("render sections"):
+            rendered = self.map_sections("render", lambda gen: gen.render_section(
+                data[gen.SECTION.name], span, lazy.get(gen.SECTION.lazy), streaming), pending, jobs)
+        for result in rendered:
+            sections.update((name, html) for name, html in result.items() if name in keys)
+        pub_data = data.get('publications') or {}
+
+        if not streaming:
+            with span("fragment cache store"):
+                outputs.update((name, sink.written) for name, sink in lazy.items() if name not in reused)
+                self.fragments.store({name: key for name, key in keys.items() if name not in reused},
+                                     sections, outputs)
+
+        # Generate update
+        updated = start_time
+        if self.config.get('REPRODUCIBLE'):
+            updated = source_date([self.config[key] for key in self.input_keys()])
+        sections['LAST_UPDATED'] = updated.strftime("%B %d, %Y")
+
+        # Responsive image variants, then the remaining static assets
+        handled_images = set()
+        if self.config.get('RESPONSIVE_IMAGES'):
+            with span("responsive images"):
+                template, handled_images = self.images.process(template)
+        page_names = None
+        self.css.stats = {}
+        if self.config.get('OPTIMIZE_CSS'):
+            # Published after the page is written, pruned against the names it uses
+            marked = self.mark_stylesheet(template)
+            if marked is not None:
+                template = marked
+                page_names = PageNames(self.config.get('CRITICAL_UNTIL'))
+                handled_images.add(self.config['CSS_FILE'])
+        with span("copy assets"):
+            asset_manifest = self.copy_assets(skip=handled_images)
+            template = template.with_assets(asset_manifest, os.path.dirname(self.config['TEMPLATE_FILE']))
+
+        # Write output file; it replaces index.html once optimized, and only if its bytes differ
+        output_path = os.path.join(self.config['OUTPUT_DIR'], "index.html")
+        with span("substitute and write index.html"):
+            with open(output_path + ".tmp", "w", encoding="utf-8") as f:
+                # Minified and scanned for CSS names while it is written, so
+                # the whole page is never held in memory
+                page = f
+                if self.config.get('MINIFY') or page_names is not None:
+                    page = PageWriter(f, minify=self.config.get('MINIFY'), names=page_names)
+                template.write(page, sections)
+                if page is not f:
+                    page.close()
+        source_size = page.source_bytes if page is not f else None
+        if 'spool' in pub_data:
+            pub_data['spool'].close()
+        for name, sink in lazy.items():
+            outputs.setdefault(name, sink.written)
+        fragment_count = self.prune_year_fragments(outputs)
+        for sink in lazy.values():
+            self.source_sizes.update(sink.source_sizes)
+        with span("optimize output"):
+            self.optimize_output(output_path, output_path + ".tmp", source_size, page_names, precompress)
+        after = snapshot_dir(self.config['OUTPUT_DIR'])
+        self.changed_files = sorted(rel for rel in before.keys() | after.keys() if before.get(rel) != after.get(rel))
+        self.profiler.stop()
+        
+        # Calculate build time
+        build_time = (datetime.now() - start_time).total_seconds()
+        print(f"✅ Site built successfully in {build_time:.2f} seconds")
+        print(f"📁 Output directory: {os.path.abspath(self.config['OUTPUT_DIR'])}")
+        print(f"🎨 Assets: {self.asset_stats['copied']} copied, {self.asset_stats['unchanged']} unchanged")
+        if self.images.stats['sources']:
+            print(f"🖼️ Images: {self.images.stats['sources']} sources, {self.images.stats['variants']} variants "
+                  f"({self.images.stats['generated']} generated)")
+        if lazy:
+            print(f"🧩 Lazy year fragments: {fragment_count} files in {YearFragments.FOLDER}/")
+        if reused:
+            print(f"♻️ Reused sections: {', '.join(reused)}")
+        rendered = [name for name in keys if name not in reused]
+        if rendered:
+            print(f"🔨 Rendered sections: {', '.join(rendered)}")
+            times = ", ".join(f"{name} {t['load']:.1f}/{t['render']:.1f}" for name, t in self.section_times.items())
+            print(f"⏱️ Section load/render ms ({'1 thread' if jobs == 1 else 'thread pool'}): {times}")
+        if streaming:
+            print(f"🌊 Streaming mode: {pub_data['stats']['total_publications']} publications in a single pass")
+        elif 'index' in pub_data:
+            pub_index = pub_data['index']
+            cache_stats = self.pub_gen.bib_cache.stats
+            print(f"🗃️ BibTeX cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                  f"{cache_stats['bytes'] / 1024:.1f} KB")
+            if len(pub_index):
+                print(f"📇 Publication index: {len(pub_index)} entries, "
+                      f"{pub_index.nbytes() / len(pub_index):.0f} bytes/entry, "
+                      f"{pub_data['stats']['co_authors']} co-authors")
+        unfilled = template.unfilled(sections)
+        unknown = sorted(template.unknown(sections) + skipped)
+        if unfilled:
+            print(f"🧩 Template slots left unfilled: {', '.join(unfilled)}")
+        if unknown:
+            print(f"🧩 Sections with no slot in the template, not rendered: {', '.join(unknown)}")
+        if self.css.stats:
+            stats = self.css.stats
+            print(f"🎯 CSS: {stats['rules'] - stats['dropped']} of {stats['rules']} rules used, "
+                  f"{stats['critical'] / 1024:.1f} KB inlined as critical CSS"
+                  + ("" if stats['problems'] else ", verified against the built page"))
+        self.print_output_sizes()
+        if self.changed_files:
+            removed = [rel for rel in self.changed_files if rel not in after]
+            print(f"📝 Changed output files ({len(self.changed_files) - len(removed)} written, "
+                  f"{len(removed)} removed): {', '.join(self.changed_files)}")
+        else:
+            print("📝 No output file changed")
+        peak_mb = peak_memory_mb()
+        if peak_mb is not None:
+            print(f"🧠 Peak memory: {peak_mb:.1f} MB")
+        if profile:
+            self.profiler.print_table()
+            stats_path, slowest = self.profiler.write(profile)
+            print(f"📊 Profile written to {profile}")
+            if stats_path:
+                print(f"📊 cProfile stats for the slowest stage ({slowest}) written to {stats_path}")
+                pstats.Stats(stats_path).sort_stats("cumulative").print_stats(15)
+    
+    def next_change(self, today):
+        """(date, section name) of the next day the dated sections render differently, or (None, None)"""
+        changes = [(gen.next_change(today), name) for name, gen in self.generators.items() if gen.SECTION.dated]
+        changes = [change for change in changes if change[0] is not None]
+        return min(changes) if changes else (None, None)
+
+    def map_sections(self, step, func, generators, jobs=None):
+        """[func(gen) for gen in generators], run on a pool of jobs threads (None: the default size)
+
+        Results keep the order of generators. Each call is timed in a
+        "<step> <section>" span inside the caller's current span and in
+        self.section_times.
+        """
+        parent = self.profiler.stack
+
+        def run(gen):
+            name = gen.SECTION.name
+            start = time.perf_counter()
+            with self.profiler.nested(parent), self.profiler.span(f"{step} {name}"):
+                result = func(gen)
+            self.section_times[name][step] = (time.perf_counter() - start) * 1000
+            return result
+
+        if jobs == 1 or len(generators) < 2:
+            return [run(gen) for gen in generators]
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(run, generators))
+
+    def prune_year_fragments(self, outputs):
+        """Delete fragment files no section refers to any more; return how many are in use"""
+        in_use = {os.path.abspath(f) for files in outputs.values() for f in files}
+        folder = os.path.join(self.config['OUTPUT_DIR'], YearFragments.FOLDER)
+        if os.path.isdir(folder):
+            for name in os.listdir(folder):
+                path = os.path.abspath(os.path.join(folder, name))
+                # Precompressed copies go with their fragment
+                if path not in in_use and os.path.splitext(path)[0] not in in_use:
+                    os.remove(path)
+        return len(in_use)
+
+    def optimize_output(self, index_path, staged, source_size=None, page_names=None, precompress=True):
+        """Post-build stage: finish index.html and precompress every text file in OUTPUT_DIR
+
+        The page is written (and minified, see PageWriter) to staged first;
+        with page_names, its CSS is inlined there, then it replaces
+        index_path if the bytes differ. source_size is the size of the page
+        before minification. Fragments and CSS are minified when they are
+        written.
+        The .gz/.br copies are made in a process pool and only for files that
+        changed; copies whose file is gone are deleted, and formats that did
+        not make a file smaller are not tried again until its content
+        changes. With precompress=False no copy is made or refreshed. Sizes
+        are kept in self.output_sizes for the summary.
+        """
+        output_dir = self.config['OUTPUT_DIR']
+        self.output_sizes = {}
+        original = source_size or os.path.getsize(staged)
+        span = self.profiler.span
+        if page_names is not None:
+            with span("optimize css"):
+                self.publish_optimized_css(staged, page_names)
+        self.write_manifest()
+        replace_if_changed(staged, index_path)
+
+        formats = list(self.config.get('PRECOMPRESS') or ())
+        if precompress and "br" in formats and brotli is None:
+            print("⚠️ brotli package not installed, skipping .br files")
+            formats.remove("br")
+
+        files = []
+        for root, _, names in os.walk(output_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                base, ext = os.path.splitext(path)
+                if ext.lstrip(".") in ("gz", "br"):
+                    if not os.path.exists(base) or precompress and ext.lstrip(".") not in formats:
+                        os.remove(path)
+                elif ext in COMPRESSIBLE:
+                    files.append(path)
+        files.sort()
+        rels = [os.path.relpath(path, output_dir).replace(os.sep, "/") for path in files]
+        if precompress:
+            compressed = self.precompress(files, rels, formats)
+        else:
+            compressed = [({}, None)] * len(files)
+
+        for path, rel, (sizes, _) in zip(files, rels, compressed):
+            before = original if path == index_path else self.source_sizes.get(rel, os.path.getsize(path))
+            self.output_sizes[rel] = (before, os.path.getsize(path), sizes)
+
+    def precompress(self, files, rels, formats):
+        """precompress_file for each of files (rels: their OUTPUT_DIR-relative names)
+
+        Formats not worth keeping for a file are recorded in CACHE_DIR with
+        its content digest and handed back on the next build.
+        """
+        rejected_path = os.path.join(self.config['CACHE_DIR'], "precompress.pickle")
+        try:
+            with open(rejected_path, "rb") as f:
+                rejected = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            rejected = {}
+        with self.profiler.span("precompress"):
+            compressed = pool_map(precompress_file, files, [formats] * len(files),
+                                  [rejected.get(rel) for rel in rels],
+                                  jobs=self.config.get('JOBS') if formats else 1)
+        still_rejected = {rel: result[1] for rel, result in zip(rels, compressed) if result[1][1]}
+        if still_rejected != rejected:
+            write_pickle(rejected_path, still_rejected)
+        return compressed
+
+    def site_script_names(self, html_names=CssOptimizer.html_names):
+        """Names mentioned by the external scripts and the lazy year fragments (read with html_names)"""
+        names = set()
+        js_file = self.config['JS_FILE']
+        if os.path.exists(js_file):
+            with open(js_file, encoding="utf-8") as f:
+                names |= CssOptimizer.script_names(f.read())
+        folder = os.path.join(self.config['OUTPUT_DIR'], YearFragments.FOLDER)
+        if os.path.isdir(folder):
+            for name in sorted(os.listdir(folder)):
+                if name.endswith(".html"):
+                    with open(os.path.join(folder, name), encoding="utf-8") as f:
+                        names |= html_names(f.read())
+        return names
+
+    def stylesheet_link(self):
+        href = os.path.relpath(self.config['CSS_FILE'], os.path.dirname(self.config['TEMPLATE_FILE']) or ".")
+        return re.compile(r'<link\b[^>]*\bhref="(?:\./)?' + re.escape(href.replace(os.sep, "/")) + r'"[^>]*>')
+
+    def mark_stylesheet(self, template):
+        """Copy of template with the <link> to CSS_FILE replaced by CSS_PLACEHOLDER, or None
+        (with a warning) if the stylesheet cannot be optimized"""
+        css_file = self.config['CSS_FILE']
+        if not os.path.exists(css_file):
+            return None
+        marked = template.with_replaced(self.stylesheet_link(), self.CSS_PLACEHOLDER)
+        if marked is None:
+            print(f"⚠️ No <link> to {os.path.basename(css_file)} in the template, CSS left as is")
+        return marked
+
+    def publish_optimized_css(self, page_path, page_names):
+        """Publish the stylesheet pruned against the names of the written page, inline its
+        critical part in place of CSS_PLACEHOLDER and load the rest without blocking
+        rendering; then check the result
+
+        The page is copied in chunks, so it is never held in memory whole;
+        the copy is read back with HtmlNameParser for the check.
+        """
+        css_file = self.config['CSS_FILE']
+        extra = self.site_script_names()
+        with open(css_file, encoding="utf-8") as f:
+            pruned, critical = self.css.optimize(f.read(), page_names.names | extra, page_names.critical)
+        href = self.publish_asset(css_file, "", lambda text: pruned)
+        self.asset_manifest[css_file.replace(os.sep, "/")] = href
+
+        # Critical rules first; the full pruned sheet follows so the cascade is unchanged once it loads
+        head = (f'<style>{critical}</style>\n'
+                f'<link rel="stylesheet" href="{href}" media="print" onload="this.media=\'all\'">\n'
+                f'<noscript><link rel="stylesheet" href="{href}"></noscript>')
+        parser = HtmlNameParser()
+        found = False
+        keep = len(self.CSS_PLACEHOLDER) - 1
+        with open(page_path, encoding="utf-8") as src, \
+                open(page_path + ".css", "w", encoding="utf-8") as out:
+            buffer = ""
+            while True:
+                chunk = src.read(1 << 16)
+                buffer += chunk
+                if not found:
+                    i = buffer.find(self.CSS_PLACEHOLDER)
+                    if i >= 0:
+                        buffer = buffer[:i] + head + buffer[i + len(self.CSS_PLACEHOLDER):]
+                        found = True
+                    elif chunk:
+                        # The placeholder may straddle two chunks
+                        ready, buffer = buffer[:len(buffer) - keep], buffer[len(buffer) - keep:]
+                        out.write(ready)
+                        parser.feed(ready)
+                        continue
+                out.write(buffer)
+                parser.feed(buffer)
+                buffer = ""
+                if not chunk:
+                    break
+        parser.close()
+        os.replace(page_path + ".css", page_path)
+
+        # Verify against the page as written, with names from a separate parser
+        names = parser.names | self.site_script_names(HtmlNameParser.parse)
+        problems = []
+        if not found:
+            problems.append("stylesheet placeholder not found in the written page")
+        with open(os.path.join(self.config['OUTPUT_DIR'], href), encoding="utf-8") as f:
+            published = f.read()
+        if published != pruned:
+            problems.append("published stylesheet differs from the pruned one")
+        with open(css_file, encoding="utf-8") as f:
+            original = self.css.selectors(minify_css(f.read()))
+        kept = set(self.css.selectors(pruned))
+        needed = [sel for sel in original if CssOptimizer.selector_names(sel) <= names and sel not in kept]
+        if needed:
+            problems.append(f"selectors used by the page were dropped: {', '.join(needed[:5])}")
+        if any(not CssOptimizer.selector_names(sel) <= names for sel in kept):
+            problems.append("pruned stylesheet still has selectors that match nothing")
+        self.css.stats.update(critical=len(critical.encode("utf-8")), problems=problems)
+        for problem in problems:
+            print(f"⚠️ CSS check: {problem}")
+
+    def print_output_sizes(self):
+        """Per-file size table: source, minified, gzip and brotli bytes"""
+        rows = {}
+        for rel, (before, after, sizes) in self.output_sizes.items():
+            # One line for all lazy year fragments
+            key = f"{YearFragments.FOLDER}/*" if rel.startswith(YearFragments.FOLDER + "/") else rel
+            row = rows.setdefault(key, [0, 0, 0, 0, 0])
+            row[0] += 1
+            row[1] += before
+            row[2] += after
+            row[3] += sizes.get("gz", 0)
+            row[4] += sizes.get("br", 0)
+        if not rows:
+            return
+        total = [sum(col) for col in zip(*rows.values())]
+        width = max(len(key) for key in rows) + 6
+        print("📦 Output sizes (bytes):")
+        print(f"   {'file':<{width}} {'source':>9} {'minified':>9} {'gzip':>9} {'brotli':>9}")
+        for key, (count, before, after, gz, br) in list(rows.items()) + [("total", total)]:
+            label = f"{key} ({count})" if key.endswith("*") else key
+            print(f"   {label:<{width}} {before:>9} {after:>9} {gz or '-':>9} {br or '-':>9}")
+
+    def asset_sources(self):
+        """(source path, output subfolder, label, transform) for each static asset"""
+        return [
+            (self.config['CSS_FILE'], "", "CSS file", minify_css if self.config.get('MINIFY') else None),
+            (self.config['JS_FILE'], "", "JavaScript file", minify_js),
+            (os.path.join(self.config['IMG_DIR'], "photo_opt3.jpeg"), "imgs", "Profile image", None),
+        ]
+
+    def copy_assets(self, skip=()):
+        """Copy all required static assets and return {source path: published path}.
+
+        With FINGERPRINT_ASSETS, files are published as name.<hash>.ext so they
+        can be served with long-lived immutable cache headers. Files whose
+        content is already in the output folder are not copied again. The
+        mapping is written to asset-manifest.json by optimize_output, once the
+        stylesheet is published too.
+        """
+        self.asset_stats = {'copied': 0, 'unchanged': 0}
+        self.source_sizes = {}
+        manifest = {}
+        for src, subdir, label, transform in self.asset_sources():
+            if src in skip:
+                continue
+            if os.path.exists(src):
+                manifest[src.replace(os.sep, "/")] = self.publish_asset(src, subdir, transform)
+            else:
+                print(f"⚠️ {label} not found: {src}")
+
+        self.asset_manifest = manifest
+        return manifest
+
+    def write_manifest(self):
+        manifest_path = os.path.join(self.config['OUTPUT_DIR'], "asset-manifest.json")
+        write_if_changed(manifest_path, (json.dumps(self.asset_manifest, indent=2, sort_keys=True) + "\n").encode("utf-8"))
+
+    def publish_asset(self, src, subdir, transform=None):
+        """Copy src into OUTPUT_DIR/subdir unless identical content is already there
+
+        transform, if given, maps the text of src to the text that is published.
+        """
+        content = None
+        if transform is None:
+            digest = file_digest(src)
+        else:
+            with open(src, encoding="utf-8") as f:
+                content = transform(f.read()).encode("utf-8")
+            digest = hashlib.sha256(content).hexdigest()
+        name = os.path.basename(src)
+        stem, ext = os.path.splitext(name)
+        if self.config.get('FINGERPRINT_ASSETS'):
+            name = f"{stem}.{digest[:8]}{ext}"
+        dest_dir = os.path.join(self.config['OUTPUT_DIR'], subdir)
+        dest = os.path.join(dest_dir, name)
+        os.makedirs(dest_dir, exist_ok=True)
+
+        if os.path.exists(dest) and file_digest(dest) == digest:
+            self.asset_stats['unchanged'] += 1
+        elif content is None:
+            atomic_copy(src, dest)
+            self.asset_stats['copied'] += 1
+        else:
+            write_if_changed(dest, content)
+            self.asset_stats['copied'] += 1
+
+        self.source_sizes[f"{subdir}/{name}" if subdir else name] = os.path.getsize(src)
+
+        # Drop older copies of the same asset, fingerprinted or not
+        stale = re.compile(re.escape(stem) + r'(?:\.[0-9a-f]{8})?' + re.escape(ext))
+        for existing in os.listdir(dest_dir):
+            if existing != name and stale.fullmatch(existing):
+                os.remove(os.path.join(dest_dir, existing))
+        return f"{subdir}/{name}" if subdir else name
+
+class FileWatcher:
+    """Reports changes to a set of files, through inotify on Linux or by polling mtimes
+
+    The parent folders are watched rather than the files, so editors that
+    save by writing a temporary file and renaming it are seen too.
+    """
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, paths, poll_interval=0.5, use_inotify=True):
+        self.paths = {os.path.abspath(p) for p in paths}
+        self.poll_interval = poll_interval
+        self.fd = None
+        if use_inotify:
+            self.fd = self._inotify()
+        self.mode = "inotify" if self.fd is not None else "polling"
+        self.mtimes = self._stat()
+
+    def _inotify(self):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            self.watches = {}
+            mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+            for folder in {os.path.dirname(p) for p in self.paths}:
+                wd = libc.inotify_add_watch(fd, folder.encode(), mask)
+                if wd < 0:
+                    os.close(fd)
+                    return None
+                self.watches[wd] = folder
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _stat(self):
+        mtimes = {}
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                mtimes[path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def wait(self, timeout=None):
+        """Block until a watched file changes or timeout seconds pass; return the changed paths"""
+        if self.fd is None:
+            return self._poll(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        # Events for other files in the watched folders (the build's own output) are skipped
+        while not changed:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                break
+            data = os.read(self.fd, 64 * 1024)
+            pos = 0
+            while pos < len(data):
+                wd, _, _, length = self.EVENT.unpack_from(data, pos)
+                pos += self.EVENT.size
+                name = data[pos:pos + length].rstrip(b"\0").decode(errors="replace")
+                pos += length
+                path = os.path.join(self.watches.get(wd, ""), name)
+                if path in self.paths:
+                    changed.add(path)
+        return changed
+
+    def _poll(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            mtimes = self._stat()
+            changed = {path for path in self.paths if mtimes[path] != self.mtimes[path]}
+            self.mtimes = mtimes
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.poll_interval if deadline is None
+                       else max(0, min(self.poll_interval, deadline - time.monotonic())))
+
+
+class LiveReloadServer(http.server.ThreadingHTTPServer):
+    """Serves OUTPUT_DIR on localhost and tells open pages to reload after each build
+
+    HTML pages get a small script that listens on /__livereload (server-
+    sent events) and pings /__livereload/loaded once the reloaded page has
+    finished loading; the first ping after a reload reports the
+    change-to-reload latency. Fetches of other files (lazy year fragments
+    included) do not count.
+    """
+    daemon_threads = True
+    EVENTS_PATH = "/__livereload"
+    LOADED_PATH = EVENTS_PATH + "/loaded"
+    CLIENT_SCRIPT = ("<script>new EventSource('" + EVENTS_PATH + "').onmessage = "
+                     "function () { location.reload(); };"
+                     "addEventListener('load', function () { fetch('" + LOADED_PATH + "'); });</script>")
+
+    def __init__(self, directory, port):
+        self.directory = directory
+        self.generation = 0
+        self.changed = threading.Condition()
+        self.pending_since = None  # perf_counter of the change behind the last reload
+        super().__init__(("127.0.0.1", port), self.handler_class())
+
+    def handler_class(self):
+        server = self
+
+        class Handler(http.server.SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=server.directory, **kwargs)
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == server.EVENTS_PATH:
+                    return self.stream_events()
+                if self.path == server.LOADED_PATH:
+                    self.send_response(204)
+                    self.send_header("Cache-Control", "no-store")
+                    self.end_headers()
+                    return server.page_loaded()
+                path = self.translate_path(self.path)
+                if os.path.isdir(path):
+                    path = os.path.join(path, "index.html")
+                if not path.endswith(".html") or not os.path.isfile(path):
+                    return super().do_GET()
+                with open(path, "rb") as f:
+                    body = f.read().replace(b"</body>", server.CLIENT_SCRIPT.encode() + b"</body>", 1)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def stream_events(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                seen = server.generation
+                try:
+                    while True:
+                        with server.changed:
+                            server.changed.wait_for(lambda: server.generation != seen, timeout=15)
+                            current = server.generation
+                        # A comment every 15 s finds closed connections
+                        self.wfile.write(b"data: reload\n\n" if current != seen else b": ping\n\n")
+                        self.wfile.flush()
+                        seen = current
+                except OSError:
+                    pass
+
+        return Handler
+
+    def reload(self, since):
+        with self.changed:
+            self.generation += 1
+            self.pending_since = since
+            self.changed.notify_all()
+
+    def page_loaded(self):
+        since, self.pending_since = self.pending_since, None
+        if since is not None:
+            print(f"🌐 Browser reloaded {(time.perf_counter() - since) * 1000:.0f} ms after the change")
+
+
+def watch(config, port=8000, debounce=0.2, use_inotify=True, **build_options):
+    """Build, serve OUTPUT_DIR and rebuild whenever an input file changes
+
+    Bursts of saves within `debounce` seconds are merged into one rebuild.
+    Unchanged sections come from the fragment cache, so only what the
+    change touches is rendered again. Precompression is skipped, since the
+    local server does not use the .gz/.br files; they are left as they are.
+    Returns False if port cannot be used.
+    """
+    try:
+        server = LiveReloadServer(os.path.abspath(config['OUTPUT_DIR']), port)
+    except OSError as e:
+        print(f"❌ Cannot serve on port {port}: {e.strerror}; choose another one with --port")
+        return False
+    build_options = dict(build_options, precompress=False)
+    inputs = [config[key] for key in SiteBuilder.input_keys()]
+    watcher = FileWatcher(inputs, use_inotify=use_inotify)
+    builder = SiteBuilder(config)
+    builder.build_site(**build_options)
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"👀 Watching {len(watcher.paths)} files ({watcher.mode}), "
+          f"serving http://127.0.0.1:{server.server_port}/ — Ctrl+C to stop")
+    try:
+        while True:
+            changed = watcher.wait()
+            since = time.perf_counter()
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            names = ", ".join(sorted(os.path.relpath(p) for p in changed))
+            print(f"\n🔄 Changed: {names}")
+            try:
+                builder.build_site(**build_options)
+            except Exception as e:  # keep watching after a broken edit
+                print(f"❌ Build failed: {e}")
+                continue
+            server.reload(since)
+            print(f"⚡ Rebuilt {(time.perf_counter() - since) * 1000:.0f} ms after the change, reload sent")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        server.shutdown()
+    return True
+
+
+def schedule(config, horizon_days=None, interval_hours=24, **build_options):
+    """Build, then rebuild whenever the date makes the output change
+
+    After each build the dated sections (see Section) report the next day
+    their output differs, e.g. when the earliest upcoming news item passes.
+    The scheduler sleeps until that midnight, or for horizon_days if that
+    comes first, and builds again; the fragment cache keeps every other
+    section. LAST_UPDATED only records when the page was built and does not
+    trigger a rebuild. Edits to the input files are not watched (see watch).
+    The log compares the number of builds with rebuilding every
+    interval_hours.
+    """
+    builder = SiteBuilder(config)
+    started = datetime.now()
+    builds = 0
+    try:
+        while True:
+            builder.build_site(**build_options)
+            builds += 1
+            now = datetime.now()
+            change, section = builder.next_change(now.date())
+            wake = datetime.combine(change, datetime.min.time()) if change else None
+            reason = f"{section} changes on {change}"
+            if horizon_days and (wake is None or wake - now > timedelta(days=horizon_days)):
+                wake, reason = now + timedelta(days=horizon_days), f"horizon of {horizon_days} days"
+            fixed = int((now - started) / timedelta(hours=interval_hours)) + 1
+            print(f"🗓️ {builds} builds, {max(0, fixed - builds)} avoided compared with "
+                  f"rebuilding every {interval_hours:g} h")
+            if wake is None:
+                print("🗓️ No dated section will change; nothing left to schedule")
+                return
+            print(f"😴 Next build {wake:%Y-%m-%d %H:%M} ({reason}) — Ctrl+C to stop")
+            # Short sleeps, so a suspended machine catches up soon after it wakes
+            while datetime.now() < wake:
+                time.sleep(min(60, max(0.0, (wake - datetime.now()).total_seconds())))
+    except KeyboardInterrupt:
+        print("\n👋 Scheduler stopped")
+
+
+class BuildDaemon(socketserver.UnixStreamServer):
+    """Resident builder answering build requests on a Unix domain socket
+
+    One SiteBuilder is kept for the life of the process, so the imports,
+    parsed BibTeX entries, compiled template and rendered sections stay in
+    memory between builds. Each request is one JSON line with the build
+    options and the client's working directory; the reply is one JSON line
+    with ok, the build log, the total time and per-stage timings.
+    Requests are handled one at a time.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.builder = SiteBuilder(config)
+        self.cwd = os.path.realpath(os.getcwd())
+        self.builds = 0
+        path = config['DAEMON_SOCKET']
+        if os.path.exists(path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+                raise RuntimeError(f"a build daemon is already listening on {path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.remove(path)  # left over from a daemon that did not shut down cleanly
+            finally:
+                probe.close()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        super().__init__(path, BuildRequestHandler)
+
+    def build(self, request):
+        if os.path.realpath(request.get('cwd', self.cwd)) != self.cwd:
+            return {'ok': False, 'error': f"daemon serves {self.cwd}"}
+        options = request.get('options', {})
+        log = io.StringIO()
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(log):
+                self.builder.build_site(streaming=bool(options.get('streaming')),
+                                        force=bool(options.get('force')), timings=True)
+        except Exception as e:
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}", 'log': log.getvalue()}
+        self.builds += 1
+        stages = [{key: r[key] for key in ('name', 'depth', 'wall_ms', 'cpu_ms')}
+                  for r in self.builder.profiler.report()]
+        return {'ok': True, 'log': log.getvalue(), 'seconds': time.perf_counter() - start,
+                'build': self.builds, 'stages': stages}
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class BuildRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line.strip():
+            return  # a connection probe, e.g. from a second daemon starting up
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            reply = {'ok': False, 'error': "malformed request"}
         else:
-            print(f"⚠️ Profile image not found: {profile_img_src}")
+            reply = self.server.build(request)
+        status = "✅" if reply['ok'] else "❌"
+        detail = f"{reply['seconds'] * 1000:.0f} ms" if reply['ok'] else reply['error']
+        print(f"{status} Build #{self.server.builds} requested: {detail}")
+        try:
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        except BrokenPipeError:
+            print("⚠️ Client disconnected before the reply")
+
+
+def serve_daemon(config):
+    """Run a BuildDaemon until interrupted"""
+    try:
+        daemon = BuildDaemon(config)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return False
+    print(f"🛰️ Build daemon listening on {config['DAEMON_SOCKET']} (Ctrl+C to stop)")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Build daemon stopped")
+    finally:
+        daemon.server_close()
+
+
+def load_batch(path, base=CONFIG):
+    """(name, config) for every site listed in a batch file
+
+    The file holds a JSON list of sites, or an object with "defaults" and
+    "sites". Each site is a dict of CONFIG keys merged over the defaults and
+    base, plus an optional "name" (default: the OUTPUT_DIR folder name).
+    Sites without their own CACHE_DIR get CACHE_DIR/sites/<name>.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    defaults, sites = ({}, data) if isinstance(data, list) else (data.get('defaults', {}), data['sites'])
+    batch = []
+    for site in sites:
+        site = dict(site)
+        name = site.pop('name', None)
+        config = dict(base, **{**defaults, **site})
+        name = name or os.path.basename(os.path.normpath(config['OUTPUT_DIR']))
+        if 'CACHE_DIR' not in site and 'CACHE_DIR' not in defaults:
+            config['CACHE_DIR'] = os.path.join(base['CACHE_DIR'], "sites", name)
+        batch.append((name, config))
+    for key in ('OUTPUT_DIR', 'CACHE_DIR'):
+        folders = Counter(os.path.abspath(config[key]) for _, config in batch)
+        shared = [folder for folder, count in folders.items() if count > 1]
+        if shared:
+            raise ValueError(f"sites in {path} share {key} {', '.join(shared)}")
+    return batch
+
+
+# BibliographyIndex objects handed to each batch worker process once
+_batch_bibliographies = {}
+
+
+def _init_batch_worker(bibliographies):
+    global _batch_bibliographies
+    _batch_bibliographies = bibliographies
+
+
+def build_batch_site(name, config, force=False):
+    """Build one site of a batch in a worker process; returns its log and timings"""
+    log = io.StringIO()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        with contextlib.redirect_stdout(log):
+            builder = SiteBuilder(config, bibliographies=_batch_bibliographies)
+            builder.build_site(force=force, timings=True)
+    except Exception as e:
+        return {'name': name, 'ok': False, 'error': f"{type(e).__name__}: {e}", 'log': log.getvalue()}
+    stages = [r for r in builder.profiler.report() if r['depth'] == 0]
+    slowest = max(stages, key=lambda r: r['wall_ms'], default=None)
+    return {'name': name, 'ok': True, 'log': log.getvalue(),
+            'wall_ms': (time.perf_counter() - wall) * 1000, 'cpu_ms': (time.process_time() - cpu) * 1000,
+            'slowest': slowest and (slowest['name'], slowest['wall_ms'])}
+
+
+def build_batch(path, config=CONFIG, jobs=None, force=False):
+    """Build every site of a batch file (see load_batch) in a process pool
+
+    Each BibTeX file is parsed once, in this process, and indexed by author;
+    the workers receive the index and look up their site's entries in it.
+    Inside a worker, image variants and .gz/.br copies are made without a
+    further pool. Returns True if every site was built.
+    """
+    start = time.perf_counter()
+    try:
+        sites = load_batch(path, config)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"❌ Cannot read batch file {path}: {e}")
+        return False
+    jobs = jobs or min(len(sites), os.cpu_count() or 1)
+    sites = [(name, dict(site, JOBS=1)) for name, site in sites]
+    cache_root = config['CACHE_DIR']
+
+    # Shared inputs: parse each bibliography once, in the shared cache folder
+    bibliographies = {}
+    for _, site in sites:
+        bib_file = os.path.abspath(site['BIB_FILE'])
+        if bib_file not in bibliographies:
+            cache_dir = os.path.join(cache_root, "bib-" + hashlib.sha256(bib_file.encode()).hexdigest()[:8])
+            gen = PublicationGenerator(dict(site, CACHE_DIR=cache_dir))
+            entries = gen.read_bibtex_entries()
+            if entries is not None:
+                bibliographies[bib_file] = BibliographyIndex(entries, gen)
+    parse_ms = (time.perf_counter() - start) * 1000
+    print(f"🏭 Batch: {len(sites)} sites, {len(bibliographies)} BibTeX files parsed once "
+          f"({parse_ms:.0f} ms), {jobs} worker processes")
+
+    publications = {}
+    for name, site in sites:
+        index = bibliographies.get(os.path.abspath(site['BIB_FILE']))
+        if index is not None:
+            normalize = PublicationGenerator(site).normalize_author_for_matching
+            publications[name] = (len(index.select_rows(site['AUTHOR_VARIANTS'], normalize))
+                                  if site.get('FILTER_BY_AUTHOR') else len(index.entries))
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker,
+                             initargs=(bibliographies,)) as pool:
+        futures = [pool.submit(build_batch_site, name, site, force) for name, site in sites]
+        results = [future.result() for future in futures]
+
+    total_ms = (time.perf_counter() - start) * 1000
+    print(f"⏱️ {'site':<24} {'pubs':>6} {'wall ms':>9} {'cpu ms':>9}  slowest stage")
+    for result in results:
+        pubs = publications.get(result['name'], 0)
+        if result['ok']:
+            stage, stage_ms = result['slowest'] or ("", 0)
+            print(f"   {result['name']:<24} {pubs:>6} {result['wall_ms']:>9.1f} {result['cpu_ms']:>9.1f}  "
+                  f"{stage} ({stage_ms:.1f} ms)")
+        else:
+            print(f"❌ {result['name']:<24} {result['error']}")
+            print(result['log'], end="")
+    built = [r for r in results if r['ok']]
+    site_ms = sum(r['wall_ms'] for r in built)
+    print(f"✅ {len(built)} of {len(results)} sites built in {total_ms / 1000:.2f} seconds "
+          f"({site_ms / 1000:.2f} s of site builds, {site_ms / total_ms:.1f}x in parallel)")
+    return len(built) == len(results)
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process in MB, if the platform reports it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the academic website into OUTPUT_DIR")
+    parser.add_argument("--streaming", action="store_true",
+                        help="parse and render the bibliography in one constant-memory pass")
+    parser.add_argument("--force", action="store_true",
+                        help="render every section again instead of reusing cached fragments")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="stamp LAST_UPDATED from the inputs' date so unchanged inputs give identical output")
+    parser.add_argument("--profile", nargs="?", const="build-profile.json", metavar="PATH",
+                        help="write per-stage wall/CPU/memory timings as a Chrome trace "
+                             "(default: build-profile.json)")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="with --profile, also save cProfile stats of the slowest stage")
+    parser.add_argument("--scroll-tracking", choices=sorted(ScrollScriptGenerator.SCROLL_TRACKING),
+                        help="section tracking used by the scroll script (default: CONFIG['SCROLL_TRACKING'])")
+    parser.add_argument("--daemon", action="store_true",
+                        help="stay resident and build on requests from build_client.py")
+    parser.add_argument("--batch", metavar="SITES_JSON",
+                        help="build every site listed in a batch file in a process pool")
+    parser.add_argument("--jobs", type=int, metavar="N",
+                        help="threads loading and rendering sections and processes for images and "
+                             "compression (CONFIG['JOBS']); with --batch, sites built in parallel")
+    parser.add_argument("--schedule", action="store_true",
+                        help="stay resident and rebuild when the date changes the output (e.g. news passing)")
+    parser.add_argument("--horizon", type=float, metavar="DAYS",
+                        help="with --schedule, rebuild at least every DAYS days")
+    parser.add_argument("--interval", type=float, default=24, metavar="HOURS",
+                        help="with --schedule, fixed rebuild interval to compare against (default: 24)")
+    parser.add_argument("--watch", action="store_true",
+                        help="serve OUTPUT_DIR, rebuild when an input changes and reload open pages")
+    parser.add_argument("--port", type=int, default=8000, help="port for --watch (default: 8000)")
+    parser.add_argument("--poll", action="store_true", help="with --watch, poll files instead of using inotify")
+    parser.add_argument("--lazy-years", nargs="*", metavar="SECTION",
+                        choices=sorted(SiteBuilder.lazy_sections()),
+                        help="load hidden years of these sections on demand "
+                             "(default with no value: publications)")
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
-    builder = SiteBuilder(CONFIG)
-    builder.build_site()
+    args = parse_args()
+    config = CONFIG
+    if args.lazy_years is not None:
+        config = dict(config, LAZY_YEARS=args.lazy_years or ['publications'])
+    if args.scroll_tracking:
+        config = dict(config, SCROLL_TRACKING=args.scroll_tracking)
+    if args.reproducible:
+        config = dict(config, REPRODUCIBLE=True)
+    if args.jobs and not args.batch:
+        config = dict(config, JOBS=args.jobs)
+    if args.batch:
+        sys.exit(0 if build_batch(args.batch, config, jobs=args.jobs, force=args.force) else 1)
+    elif args.daemon:
+        serve_daemon(config)
+    elif args.schedule:
+        schedule(config, horizon_days=args.horizon, interval_hours=args.interval,
+                 streaming=args.streaming)
+    elif args.watch:
+        sys.exit(0 if watch(config, port=args.port, use_inotify=not args.poll, streaming=args.streaming) else 1)
+    else:
+        builder = SiteBuilder(config)
+        builder.build_site(streaming=args.streaming, force=args.force,
+                           profile=args.profile, cprofile=args.cprofile)
@@ -5,7 +5,8 @@
 # Function to display usage information
 usage() {
     echo "Usage: $0 [-b <build_script>] [-d <destination>] [-g] [-h]"
-    echo "  -b <build_script> : Specify the build script to run (default: build_site.py)"
+    echo "  -b <build_script> : Specify the build script to run (default: build_client.py,"
+    echo "                      which uses the build daemon if running, else builds in-process)"
     echo "  -d <destination>  : Specify the destination directory to copy the build output"
     echo "  -g                : Perform git add, commit, and push operations"
     echo "  -h                : Display this help message"
@@ -13,7 +14,7 @@ usage() {
 }
 
 # Default values
-BUILD_SCRIPT="build_site.py"
+BUILD_SCRIPT="build_client.py"
 DESTINATION=""
 GIT_OPERATION=false
 
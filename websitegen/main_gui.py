@@ -8,6 +8,10 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 
+# The generator shipped next to this GUI, built through build_client.py
+BUNDLED_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLED_BUILD_SCRIPT = os.path.join(BUNDLED_DIR, "build_site.py")
+
 def run_command(command, check=True):
     """Run a shell command and handle errors."""
     try:
@@ -342,9 +346,12 @@ class AcademicWebsiteBuilder:
             messagebox.showerror("Error", f"The build script '{self.build_script}' does not exist.")
             return
         
-        # Run the build script
+        # Run the build script (the bundled one through the build daemon when it is running)
         print(f"Running build script: {self.build_script}")
-        build_result = run_command(f"python3 {self.build_script}")
+        if os.path.realpath(self.build_script) == os.path.realpath(BUNDLED_BUILD_SCRIPT):
+            build_result = run_command(f"python3 {os.path.join(BUNDLED_DIR, 'build_client.py')}")
+        else:
+            build_result = run_command(f"python3 {self.build_script}")
         if not build_result:
             messagebox.showerror("Error", "Build failed. Exiting.")
             return
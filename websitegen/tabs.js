@@ -0,0 +1,48 @@
+// Tab controller shared by publications, courses and presentations.
+// Every tab button names the panel it shows in data-tab; the buttons sharing a
+// parent element form one group. Panels with a data-src attribute (LAZY_YEARS)
+// are fetched the first time they are needed.
+(function () {
+    const pending = new Map();
+
+    function load(panel) {
+        const src = panel.getAttribute('data-src');
+        if (!src) return;
+        if (!pending.has(src)) {
+            pending.set(src, fetch(src).then(response => {
+                if (!response.ok) throw new Error(response.status);
+                return response.text();
+            }));
+        }
+        pending.get(src).then(html => {
+            if (panel.getAttribute('data-src') === src) {
+                panel.innerHTML = html;
+                panel.removeAttribute('data-src');
+            }
+        }, () => pending.delete(src));
+    }
+
+    function select(tab) {
+        tab.parentElement.querySelectorAll('[data-tab]').forEach(other => {
+            const panel = document.getElementById(other.getAttribute('data-tab'));
+            const active = other === tab;
+            other.classList.toggle('active', active);
+            if (panel) {
+                panel.style.display = active ? 'block' : 'none';
+                if (active) load(panel);
+            }
+        });
+    }
+
+    document.addEventListener('click', function (e) {
+        const tab = e.target.closest('[data-tab]');
+        if (tab) select(tab);
+    });
+
+    // Start fetching a lazy panel as soon as the pointer is over its tab
+    document.addEventListener('mouseover', function (e) {
+        const tab = e.target.closest && e.target.closest('[data-tab]');
+        const panel = tab && document.getElementById(tab.getAttribute('data-tab'));
+        if (panel) load(panel);
+    });
+})();